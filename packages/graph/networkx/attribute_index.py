@@ -0,0 +1,184 @@
+from typing import Any, Dict, Hashable, Iterable, List, Optional
+
+import networkx as nx
+
+_MISSING = object()
+
+
+class AttributeIndex:
+    """
+    In-memory hash index from node attribute values to node identifiers.
+
+    Every node of the indexed graph is stored under its value for each indexed attribute,
+    nodes without the attribute under None. A value shared by a single node maps directly to
+    that node, larger buckets are insertion-ordered dictionaries, so lookups return nodes in
+    a stable order. Nodes whose value is not hashable are kept aside and returned by every
+    lookup on that attribute, so lookups yield candidates that callers still have to match.
+    """
+
+    def __init__(self, attributes: Iterable[str]):
+        self.attributes = tuple(attributes)
+        self.graph = None
+        self._buckets: Dict[str, Dict[Any, Any]] = {name: {} for name in self.attributes}
+        self._unhashable: Dict[str, Dict[Hashable, None]] = {
+            name: {} for name in self.attributes
+        }
+        self._node_values: Dict[Hashable, tuple] = {}
+
+    @classmethod
+    def build(cls, graph: nx.MultiDiGraph, attributes: Iterable[str]) -> "AttributeIndex":
+        """
+        Index all nodes of a graph.
+
+        Parameters:
+        -----------
+
+            - graph (nx.MultiDiGraph): The graph to index.
+            - attributes (Iterable[str]): The node attributes to index.
+
+        Returns:
+        --------
+
+            - AttributeIndex: The index of the graph.
+        """
+        index = cls(attributes)
+        index.graph = graph
+        for node_id, data in graph.nodes(data=True):
+            index.add_node(node_id, data)
+        return index
+
+    def __contains__(self, node_id) -> bool:
+        return node_id in self._node_values
+
+    def add_node(self, node_id, data: dict) -> None:
+        """
+        Index a node, replacing the entries of a previously indexed version of it.
+
+        Parameters:
+        -----------
+
+            - node_id: The identifier of the node.
+            - data (dict): The current attributes of the node.
+        """
+        values = tuple(data.get(name) for name in self.attributes)
+        previous_values = self._node_values.get(node_id)
+
+        if previous_values is not None:
+            if previous_values == values:
+                return
+            self._remove(node_id, previous_values)
+
+        self._node_values[node_id] = values
+
+        for name, value in zip(self.attributes, values):
+            try:
+                bucket = self._buckets[name].get(value, _MISSING)
+            except TypeError:
+                self._unhashable[name][node_id] = None
+                continue
+
+            if bucket is _MISSING:
+                self._buckets[name][value] = node_id
+            elif type(bucket) is dict:
+                bucket[node_id] = None
+            else:
+                self._buckets[name][value] = {bucket: None, node_id: None}
+
+    def remove_node(self, node_id) -> None:
+        """
+        Drop a node from the index, nodes that are not indexed are ignored.
+
+        Parameters:
+        -----------
+
+            - node_id: The identifier of the node.
+        """
+        values = self._node_values.pop(node_id, None)
+        if values is not None:
+            self._remove(node_id, values)
+
+    def _remove(self, node_id, values: tuple) -> None:
+        for name, value in zip(self.attributes, values):
+            try:
+                bucket = self._buckets[name].get(value, _MISSING)
+            except TypeError:
+                self._unhashable[name].pop(node_id, None)
+                continue
+
+            if type(bucket) is dict:
+                del bucket[node_id]
+                if len(bucket) == 1:
+                    self._buckets[name][value] = next(iter(bucket))
+            elif bucket is not _MISSING:
+                del self._buckets[name][value]
+
+    def count(self, attribute: str, values: Iterable[Any]) -> Optional[int]:
+        """
+        Count the candidates `lookup` would return without collecting them.
+
+        Parameters:
+        -----------
+
+            - attribute (str): The attribute to look up.
+            - values (Iterable[Any]): The accepted attribute values.
+
+        Returns:
+        --------
+
+            - Optional[int]: The number of candidate nodes, or None if the attribute can't be
+              looked up in the index.
+        """
+        buckets = self._buckets.get(attribute)
+        if buckets is None:
+            return None
+
+        try:
+            values = dict.fromkeys(values)
+        except TypeError:
+            return None
+
+        count = len(self._unhashable[attribute])
+        for value in values:
+            bucket = buckets.get(value, _MISSING)
+            if type(bucket) is dict:
+                count += len(bucket)
+            elif bucket is not _MISSING:
+                count += 1
+        return count
+
+    def lookup(self, attribute: str, values: Iterable[Any]) -> Optional[List]:
+        """
+        Find the nodes whose attribute equals one of the given values.
+
+        Parameters:
+        -----------
+
+            - attribute (str): The attribute to look up.
+            - values (Iterable[Any]): The accepted attribute values.
+
+        Returns:
+        --------
+
+            - Optional[List]: The candidate node identifiers, or None if the attribute is not
+              indexed or one of the values can't be looked up, in which case the caller has
+              to scan the graph instead.
+        """
+        buckets = self._buckets.get(attribute)
+        if buckets is None:
+            return None
+
+        try:
+            values = dict.fromkeys(values)
+        except TypeError:
+            return None
+
+        node_ids = []
+        for value in values:
+            bucket = buckets.get(value, _MISSING)
+            if type(bucket) is dict:
+                node_ids.extend(bucket)
+            elif bucket is not _MISSING:
+                node_ids.append(bucket)
+
+        node_ids.extend(self._unhashable[attribute])
+        return node_ids
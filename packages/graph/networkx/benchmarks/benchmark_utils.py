@@ -0,0 +1,48 @@
+import gc
+import os
+import sys
+import time
+import pathlib
+import tempfile
+from contextlib import asynccontextmanager
+
+import networkx as nx
+
+# The adapter is imported through the packages namespace, like in example.py
+sys.path.append(str(pathlib.Path(__file__).parents[4]))
+
+from packages.graph.networkx.networkx_adapter import NetworkXAdapter  # noqa: E402
+
+
+@asynccontextmanager
+async def benchmark_adapter(graph: nx.MultiDiGraph = None, **kwargs):
+    """
+    Yield a new adapter that keeps its graph files in a temporary directory and serves the
+    given graph, which is built directly instead of through the adapter to save time.
+    """
+    previous_directory = os.getcwd()
+
+    with tempfile.TemporaryDirectory(prefix="networkx-benchmark-") as directory:
+        os.chdir(directory)
+        NetworkXAdapter._instance = None
+        NetworkXAdapter._shards = None
+        adapter = NetworkXAdapter(None, None, None, **kwargs)
+
+        try:
+            await adapter.load_graph_from_file()
+            if graph is not None:
+                adapter.graph = graph
+            yield adapter
+        finally:
+            await adapter.close()
+            os.chdir(previous_directory)
+
+
+async def timed(awaitable):
+    """
+    Await a call and return its result together with the wall clock seconds it took.
+    """
+    gc.collect()
+    start = time.perf_counter()
+    result = await awaitable
+    return result, time.perf_counter() - start
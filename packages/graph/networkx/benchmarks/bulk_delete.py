@@ -0,0 +1,94 @@
+"""
+Time removing a document-like group of nodes and their connections from a graph, through
+the bulk calls and through one delete_node call per node inside a batch.
+
+    python benchmarks/bulk_delete.py
+"""
+
+import random
+import asyncio
+import argparse
+from uuid import uuid4
+
+import networkx as nx
+
+from benchmark_utils import benchmark_adapter, timed
+
+
+def build_graph(base_count: int, document_count: int):
+    """
+    Return a graph of `base_count` nodes with `document_count` more nodes forming the
+    document, which are connected among themselves and to the rest of the graph.
+    """
+    random.seed(1)
+    base = [uuid4() for _ in range(base_count)]
+    document = [uuid4() for _ in range(document_count)]
+
+    def edges(sources, targets, count, relationship_names):
+        for _ in range(count):
+            relationship_name = random.choice(relationship_names)
+            yield (
+                random.choice(sources),
+                random.choice(targets),
+                relationship_name,
+                {"relationship_name": relationship_name},
+            )
+
+    graph = nx.MultiDiGraph()
+    graph.add_nodes_from(
+        (node_id, {"id": node_id, "type": "Entity", "name": str(node_id)})
+        for node_id in base + document
+    )
+    graph.add_edges_from(edges(base, base, 15 * document_count, ["related_to"]))
+    graph.add_edges_from(edges(document, document, 3 * document_count, ["contains", "mentions"]))
+    graph.add_edges_from(edges(document, base, document_count, ["contains", "mentions"]))
+    graph.add_edges_from(edges(base, document, document_count, ["contains", "mentions"]))
+    return graph, document
+
+
+async def delete_nodes_in_batch(adapter, node_ids):
+    async with adapter.batch():
+        await adapter.delete_nodes(node_ids)
+
+
+async def delete_node_per_node_in_batch(adapter, node_ids):
+    async with adapter.batch():
+        for node_id in node_ids:
+            await adapter.delete_node(node_id)
+
+
+async def main(document_count: int):
+    base_count = 5 * document_count
+    print(f"{base_count + document_count} nodes, document of {document_count} nodes")
+
+    graph, document = build_graph(base_count, document_count)
+    async with benchmark_adapter(graph) as adapter:
+        edge_count = graph.number_of_edges()
+
+        for label, call in (
+            ("remove_connection_to_successors_of", adapter.remove_connection_to_successors_of),
+            ("remove_connection_to_predecessors_of", adapter.remove_connection_to_predecessors_of),
+        ):
+            relationship_name = "contains" if "successors" in label else "mentions"
+            _, seconds = await timed(call(document, relationship_name))
+            print(f"{label:<38} {seconds * 1000:.0f} ms")
+
+        print(f"  {edge_count - graph.number_of_edges()} edges removed")
+
+        _, seconds = await timed(adapter.delete_nodes(document))
+        print(f"{'delete_nodes':<38} {seconds * 1000:.0f} ms")
+
+    for label, delete in (
+        ("delete_nodes inside batch()", delete_nodes_in_batch),
+        (f"{document_count} x delete_node inside batch()", delete_node_per_node_in_batch),
+    ):
+        graph, document = build_graph(base_count, document_count)
+        async with benchmark_adapter(graph) as adapter:
+            _, seconds = await timed(delete(adapter, document))
+            print(f"{label:<38} {seconds * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--document-nodes", type=int, default=10_000)
+    asyncio.run(main(parser.parse_args().document_nodes))
@@ -0,0 +1,81 @@
+"""
+Time get_document_subgraph for documents of growing size inside a larger graph. The time
+per chunk stays flat as long as the lookup is linear in the document neighbourhood.
+
+    python benchmarks/document_subgraph.py --chunks 100 1000 5000 20000
+"""
+
+import random
+import asyncio
+import argparse
+from uuid import uuid4
+
+import networkx as nx
+
+from benchmark_utils import benchmark_adapter, timed
+
+BACKGROUND_NODES = 200_000
+ENTITIES_PER_CHUNK = 8
+
+
+def add_node(graph: nx.MultiDiGraph, node_type: str, name: str = None):
+    node_id = uuid4()
+    graph.add_node(node_id, id=node_id, type=node_type, name=name or str(node_id))
+    return node_id
+
+
+def add_edge(graph: nx.MultiDiGraph, source, target, relationship_name: str):
+    graph.add_edge(source, target, relationship_name, relationship_name=relationship_name)
+
+
+def build_graph(chunk_count: int) -> nx.MultiDiGraph:
+    """
+    A document with chunks, summaries, typed entities and some entities and types that are
+    shared with the rest of the graph, so both orphan checks have work to do.
+    """
+    random.seed(0)
+    graph = nx.MultiDiGraph()
+
+    background = [add_node(graph, "Entity") for _ in range(BACKGROUND_NODES)]
+    for _ in range(BACKGROUND_NODES):
+        add_edge(graph, random.choice(background), random.choice(background), "related_to")
+
+    document = add_node(graph, "TextDocument", "text_benchmark")
+    entities = [add_node(graph, "Entity") for _ in range(2 * chunk_count)]
+    entity_types = [add_node(graph, "EntityType") for _ in range(max(chunk_count // 10, 1))]
+
+    for _ in range(chunk_count):
+        chunk = add_node(graph, "DocumentChunk")
+        add_edge(graph, chunk, document, "is_part_of")
+        add_edge(graph, add_node(graph, "TextSummary"), chunk, "made_from")
+        for entity in random.sample(entities, min(ENTITIES_PER_CHUNK, len(entities))):
+            add_edge(graph, chunk, entity, "contains")
+
+    for entity in entities:
+        add_edge(graph, entity, random.choice(entity_types), "is_a")
+        if random.random() < 0.1:
+            add_edge(graph, random.choice(background), entity, "contains")
+
+    for entity_type in random.sample(entity_types, len(entity_types) // 5):
+        add_edge(graph, random.choice(background), entity_type, "is_a")
+
+    return graph
+
+
+async def main(chunk_counts: list):
+    for chunk_count in chunk_counts:
+        async with benchmark_adapter(build_graph(chunk_count)) as adapter:
+            adapter._get_attribute_index()
+            subgraph, seconds = await timed(adapter.get_document_subgraph("benchmark"))
+
+            sizes = ", ".join(f"{key} {len(nodes)}" for key, nodes in subgraph.items())
+            print(
+                f"{chunk_count:>6} chunks: {seconds * 1000:.0f} ms "
+                f"({seconds * 1e6 / chunk_count:.0f} us per chunk) | {sizes}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--chunks", type=int, nargs="+", default=[100, 1000, 5000, 20000])
+    asyncio.run(main(parser.parse_args().chunks))
@@ -0,0 +1,102 @@
+"""
+Time get_nodeset_subgraph on a large random graph against a linear scan over all nodes and
+edges, which is what answering the query without the attribute index takes.
+
+    python benchmarks/nodeset_subgraph.py --nodes 1000000
+"""
+
+import random
+import asyncio
+import argparse
+from uuid import uuid4
+
+import networkx as nx
+
+from benchmark_utils import benchmark_adapter, timed
+
+
+class Entity:
+    pass
+
+
+def build_graph(node_count: int, edge_count: int) -> nx.MultiDiGraph:
+    random.seed(0)
+    node_ids = [uuid4() for _ in range(node_count)]
+
+    graph = nx.MultiDiGraph()
+    graph.add_nodes_from(
+        (
+            node_id,
+            {
+                "id": node_id,
+                "name": f"node {number}",
+                "type": "Entity" if number % 2 else "DocumentChunk",
+            },
+        )
+        for number, node_id in enumerate(node_ids)
+    )
+    graph.add_edges_from(
+        (
+            random.choice(node_ids),
+            random.choice(node_ids),
+            relationship_name,
+            {"relationship_name": relationship_name},
+        )
+        for relationship_name in (random.choice(["mentions", "contains"]) for _ in range(edge_count))
+    )
+    return graph
+
+
+async def linear_scan(graph: nx.MultiDiGraph, node_type: str, node_names: list):
+    primary_ids = {
+        node_id
+        for node_id, data in graph.nodes(data=True)
+        if data.get("type") == node_type and data.get("name") in node_names
+    }
+
+    node_ids = set(primary_ids)
+    for source, target in graph.edges():
+        if source in primary_ids:
+            node_ids.add(target)
+        if target in primary_ids:
+            node_ids.add(source)
+
+    nodes = [(node_id, graph.nodes[node_id]) for node_id in node_ids]
+    edges = [
+        edge
+        for edge in graph.edges(keys=True, data=True)
+        if edge[0] in node_ids and edge[1] in node_ids
+    ]
+    return nodes, edges
+
+
+async def main(node_count: int):
+    graph = build_graph(node_count, 2 * node_count)
+
+    async with benchmark_adapter(graph) as adapter:
+        adapter._get_attribute_index()
+
+        for seed_count in (1, 10, 100):
+            names = [f"node {2 * number + 1}" for number in range(seed_count)]
+
+            (nodes, edges), indexed_time = await timed(
+                adapter.get_nodeset_subgraph(Entity, names)
+            )
+            (expected_nodes, expected_edges), scan_time = await timed(
+                linear_scan(graph, "Entity", names)
+            )
+
+            equal = {node_id for node_id, _ in nodes} == {
+                node_id for node_id, _ in expected_nodes
+            } and len(edges) == len(expected_edges)
+            print(
+                f"{seed_count:>3} seeds: {len(nodes)} nodes, {len(edges)} edges | "
+                f"indexed {indexed_time * 1000:.2f} ms | linear scan {scan_time * 1000:.0f} ms | "
+                f"equal {equal}"
+            )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument("--nodes", type=int, default=1_000_000, help="edges are twice as many")
+    asyncio.run(main(parser.parse_args().nodes))
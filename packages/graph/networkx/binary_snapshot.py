@@ -0,0 +1,352 @@
+import gc
+import io
+import json
+import mmap
+import struct
+from datetime import datetime, timezone
+from typing import Any, List, Tuple
+from uuid import UUID
+
+import numpy as np
+import networkx as nx
+from cognee.modules.storage.utils import JSONEncoder
+
+MAGIC = b"CGNXBIN1"
+FORMAT_VERSION = 1
+
+# Marks a missing timestamp, or one kept in the property blob because it is not a datetime.
+NO_TIMESTAMP = np.iinfo(np.int64).min
+
+_DECODE_CHUNK_SIZE = 10000
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+
+def is_binary_snapshot(file_path: str) -> bool:
+    """
+    Check whether a graph file uses the binary snapshot format.
+
+    Parameters:
+    -----------
+
+        - file_path (str): The graph file to inspect.
+
+    Returns:
+    --------
+
+        - bool: True if the file starts with the binary snapshot magic bytes.
+    """
+    with open(file_path, "rb") as file:
+        return file.read(len(MAGIC)) == MAGIC
+
+
+def _timestamp_to_micros(value) -> int:
+    if isinstance(value, datetime):
+        if value.tzinfo is None:
+            value = value.replace(tzinfo=timezone.utc)
+        delta = value - _EPOCH
+        return (delta.days * 86400 + delta.seconds) * 1_000_000 + delta.microseconds
+    if isinstance(value, int) and not isinstance(value, bool):
+        # Integer timestamps are stored in milliseconds, see DataPoint.updated_at
+        return value * 1000
+    return NO_TIMESTAMP
+
+
+def _micros_to_timestamps(values: np.ndarray) -> List[Any]:
+    naive = values.astype("datetime64[us]").astype(object)
+    return [
+        None if value == NO_TIMESTAMP else timestamp.replace(tzinfo=timezone.utc)
+        for value, timestamp in zip(values.tolist(), naive)
+    ]
+
+
+def _encode_properties(properties: List[dict]) -> Tuple[bytes, np.ndarray]:
+    # Items are stored as one JSON array, so runs of consecutive items can be decoded in a
+    # single call, while the (start, end) spans still allow decoding a single item on its own.
+    spans = np.empty((len(properties), 2), dtype=np.int64)
+    encode = JSONEncoder().encode
+    buffer = io.BytesIO()
+    buffer.write(b"[")
+
+    for index, item in enumerate(properties):
+        if index:
+            buffer.write(b",")
+        spans[index, 0] = buffer.tell()
+        buffer.write(encode(item).encode("utf-8"))
+        spans[index, 1] = buffer.tell()
+
+    buffer.write(b"]")
+    return buffer.getvalue(), spans
+
+
+def encode_binary_snapshot(graph: nx.MultiDiGraph, mutation_log_sequence: int = 0) -> bytes:
+    """
+    Serialize a graph into the columnar binary snapshot format.
+
+    Node identifiers are stored as 16-byte UUID values and edges reference nodes by their
+    position in the node table. `updated_at` timestamps are stored as int64 microseconds and
+    relationship names are stored once in a key table, while all remaining properties are
+    kept as JSON in a side blob.
+
+    Parameters:
+    -----------
+
+        - graph (nx.MultiDiGraph): The graph to serialize.
+        - mutation_log_sequence (int): The sequence number of the last logged mutation
+          contained in the graph. (default 0)
+
+    Returns:
+    --------
+
+        - bytes: The encoded snapshot.
+    """
+    node_count = graph.number_of_nodes()
+    node_index = {}
+    node_ids = []
+    node_timestamps = []
+    node_properties = []
+    other_node_ids = []
+    empty_id = bytes(16)
+
+    for index, (node_id, data) in enumerate(graph.nodes(data=True)):
+        node_index[node_id] = index
+
+        if isinstance(node_id, UUID):
+            node_ids.append(node_id.bytes)
+        else:
+            node_ids.append(empty_id)
+            other_node_ids.append([index, node_id])
+
+        properties = {key: value for key, value in data.items() if key != "id"}
+        timestamp = _timestamp_to_micros(properties.get("updated_at"))
+        if timestamp != NO_TIMESTAMP:
+            del properties["updated_at"]
+        node_timestamps.append(timestamp)
+        node_properties.append(properties)
+
+    edge_count = graph.number_of_edges()
+    edge_sources = []
+    edge_targets = []
+    edge_keys = []
+    edge_timestamps = []
+    edge_properties = []
+    key_index = {}
+
+    for source, target, key, data in graph.edges(keys=True, data=True):
+        edge_sources.append(node_index[source])
+        edge_targets.append(node_index[target])
+        edge_keys.append(key_index.setdefault(key, len(key_index)))
+
+        properties = {
+            name: value
+            for name, value in data.items()
+            if name not in ("source_node_id", "target_node_id")
+        }
+        timestamp = _timestamp_to_micros(properties.get("updated_at"))
+        if timestamp != NO_TIMESTAMP:
+            del properties["updated_at"]
+        edge_timestamps.append(timestamp)
+        edge_properties.append(properties)
+
+    node_blob, node_spans = _encode_properties(node_properties)
+    edge_blob, edge_spans = _encode_properties(edge_properties)
+
+    sections = [
+        ("node_ids", b"".join(node_ids)),
+        ("node_timestamps", np.array(node_timestamps, dtype=np.int64).tobytes()),
+        ("node_property_spans", node_spans.tobytes()),
+        ("node_properties", node_blob),
+        ("edge_sources", np.array(edge_sources, dtype=np.int64).tobytes()),
+        ("edge_targets", np.array(edge_targets, dtype=np.int64).tobytes()),
+        ("edge_keys", np.array(edge_keys, dtype=np.int32).tobytes()),
+        ("edge_timestamps", np.array(edge_timestamps, dtype=np.int64).tobytes()),
+        ("edge_property_spans", edge_spans.tobytes()),
+        ("edge_properties", edge_blob),
+        ("key_table", json.dumps(list(key_index), cls=JSONEncoder).encode("utf-8")),
+        ("other_node_ids", json.dumps(other_node_ids, cls=JSONEncoder).encode("utf-8")),
+    ]
+
+    header = {
+        "version": FORMAT_VERSION,
+        "graph": graph.graph,
+        "mutation_log_sequence": mutation_log_sequence,
+        "node_count": node_count,
+        "edge_count": edge_count,
+        "sections": {},
+    }
+
+    # Sections are 8-byte aligned so numeric columns can be mapped without copying.
+    offset = 0
+    for name, data in sections:
+        header["sections"][name] = [offset, len(data)]
+        offset += len(data) + (-len(data) % 8)
+
+    header_bytes = json.dumps(header, cls=JSONEncoder).encode("utf-8")
+    header_bytes += b" " * (-(len(MAGIC) + 8 + len(header_bytes)) % 8)
+
+    output = io.BytesIO()
+    output.write(MAGIC)
+    output.write(struct.pack("<Q", len(header_bytes)))
+    output.write(header_bytes)
+    for _, data in sections:
+        output.write(data)
+        output.write(b"\0" * (-len(data) % 8))
+
+    return output.getvalue()
+
+
+class BinarySnapshot:
+    """
+    Read-only, memory-mapped view of a binary graph snapshot.
+
+    Numeric columns are read as zero-copy NumPy arrays over the mapped file, and the
+    properties are decoded in bulk when the graph is materialized.
+    """
+
+    def __init__(self, file_path: str):
+        self._file = open(file_path, "rb")
+        self._mmap = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        if self._mmap[: len(MAGIC)] != MAGIC:
+            self.close()
+            raise ValueError(f"{file_path} is not a binary graph snapshot")
+
+        (header_length,) = struct.unpack_from("<Q", self._mmap, len(MAGIC))
+        header_start = len(MAGIC) + 8
+        self.header = json.loads(self._mmap[header_start : header_start + header_length])
+        self._data_start = header_start + header_length
+
+        if self.header["version"] != FORMAT_VERSION:
+            self.close()
+            raise ValueError(
+                f"Unsupported binary graph snapshot version: {self.header['version']}"
+            )
+
+        self.node_count = self.header["node_count"]
+        self.edge_count = self.header["edge_count"]
+        self.mutation_log_sequence = self.header["mutation_log_sequence"]
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self) -> None:
+        """
+        Release the memory map and the underlying file.
+        """
+        if not self._mmap.closed:
+            self._mmap.close()
+        self._file.close()
+
+    def _section(self, name: str) -> memoryview:
+        offset, length = self.header["sections"][name]
+        start = self._data_start + offset
+        return memoryview(self._mmap)[start : start + length]
+
+    def _column(self, name: str, dtype) -> np.ndarray:
+        return np.frombuffer(self._section(name), dtype=dtype)
+
+    def node_ids(self) -> List[Any]:
+        """
+        Decode the identifiers of all nodes in snapshot order.
+        """
+        # Imported here, graph_serialization imports this module
+        from .graph_serialization import parse_node_id
+
+        raw = self._section("node_ids").tobytes()
+        node_ids = [UUID(bytes=raw[start : start + 16]) for start in range(0, len(raw), 16)]
+
+        # Identifiers that are not UUIDs are parsed like the JSON snapshot loader parses them
+        for index, node_id in json.loads(self._section("other_node_ids").tobytes()):
+            node_ids[index] = parse_node_id(node_id)
+
+        return node_ids
+
+    def _decode_all(self, blob: str, spans: str, timestamps: str) -> List[dict]:
+        from .graph_serialization import parse_timestamp
+
+        data = self._section(blob)
+        spans = self._column(spans, np.int64).reshape(-1, 2)
+        items = []
+
+        # Decoded in chunks rather than in one call, so other threads (such as the event loop
+        # while a snapshot loads in a worker thread) get to run in between.
+        for start in range(0, len(spans), _DECODE_CHUNK_SIZE):
+            chunk = spans[start : start + _DECODE_CHUNK_SIZE]
+            items.extend(
+                json.loads(b"[" + data[chunk[0, 0] : chunk[-1, 1]].tobytes() + b"]")
+            )
+
+        for properties, timestamp in zip(
+            items, _micros_to_timestamps(self._column(timestamps, np.int64))
+        ):
+            if timestamp is not None:
+                properties["updated_at"] = timestamp
+            elif "updated_at" in properties:
+                # Timestamps that were not stored as a column, e.g. strings
+                parse_timestamp(properties)
+        return items
+
+    def to_graph(self) -> nx.MultiDiGraph:
+        """
+        Materialize the snapshot as a graph.
+
+        Returns:
+        --------
+
+            - nx.MultiDiGraph: The graph stored in the snapshot.
+        """
+        # Building millions of small dicts repeatedly triggers the cyclic garbage collector,
+        # which has nothing to collect here but rescans the growing heap every time.
+        gc_enabled = gc.isenabled()
+        gc.disable()
+        try:
+            return self._build_graph()
+        finally:
+            if gc_enabled:
+                gc.enable()
+
+    def _build_graph(self) -> nx.MultiDiGraph:
+        graph = nx.MultiDiGraph(**self.header["graph"])
+
+        node_ids = self.node_ids()
+        node_properties = self._decode_all(
+            "node_properties", "node_property_spans", "node_timestamps"
+        )
+        graph.add_nodes_from(zip(node_ids, node_properties))
+
+        # Edges are inserted into the adjacency dictionaries directly. Going through
+        # add_edges_from hashes every endpoint several times per edge, which dominates load
+        # time on large graphs, while here nodes are resolved by their position instead.
+        successors = [graph._succ[node_id] for node_id in node_ids]
+        predecessors = [graph._pred[node_id] for node_id in node_ids]
+        key_table = json.loads(self._section("key_table").tobytes())
+        edge_attr_dict_factory = graph.edge_attr_dict_factory
+        edge_key_dict_factory = graph.edge_key_dict_factory
+
+        for source, target, key, properties in zip(
+            self._column("edge_sources", np.int64).tolist(),
+            self._column("edge_targets", np.int64).tolist(),
+            self._column("edge_keys", np.int32).tolist(),
+            self._decode_all("edge_properties", "edge_property_spans", "edge_timestamps"),
+        ):
+            source_id, target_id = node_ids[source], node_ids[target]
+            # Endpoint copies are restored the same way as when loading a JSON snapshot
+            properties["source_node_id"] = source_id
+            properties["target_node_id"] = target_id
+
+            key_dict = successors[source].get(target_id)
+            if key_dict is None:
+                key_dict = edge_key_dict_factory()
+                successors[source][target_id] = key_dict
+                predecessors[target][source_id] = key_dict
+
+            edge_data = key_dict.get(key_table[key])
+            if edge_data is None:
+                edge_data = edge_attr_dict_factory()
+                key_dict[key_table[key]] = edge_data
+            edge_data.update(properties)
+
+        return graph
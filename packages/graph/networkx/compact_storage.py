@@ -0,0 +1,151 @@
+import sys
+from datetime import datetime
+from typing import Optional
+from uuid import UUID
+
+import networkx as nx
+
+# Longer strings are mostly unique texts, interning them would only cost time
+_MAX_INTERNED_LENGTH = 100
+
+
+class AttributeCompactor:
+    """
+    Share equal attribute keys and values between the nodes and edges of a graph.
+
+    Attribute keys and short strings such as types and relationship names are interned.
+    Node identifiers stored in attributes (the `id` of nodes and the `source_node_id` and
+    `target_node_id` of edges) point to the object the graph uses as node key instead of
+    holding copies of it, and other equal UUIDs and timestamps compacted by the same compactor
+    share a single object. The attributes keep their values, only duplicated objects are
+    dropped.
+    """
+
+    def __init__(self, graph: nx.MultiDiGraph):
+        self.graph = graph
+        # Scoped to the compactor, so values of deleted nodes are not kept alive
+        self._values = {}
+
+    def node_id(self, node_id):
+        """
+        Return the identifier object the graph already holds for a node, if any.
+        """
+        data = self.graph._node.get(node_id)
+        if data is not None:
+            canonical_id = data.get("id")
+            if canonical_id == node_id and type(canonical_id) is type(node_id):
+                return canonical_id
+        return node_id
+
+    def value(self, value):
+        value_type = type(value)
+
+        if value_type is str:
+            return sys.intern(value) if len(value) <= _MAX_INTERNED_LENGTH else value
+        if value_type is UUID:
+            canonical_id = self.node_id(value)
+            if canonical_id is not value:
+                return canonical_id
+            return self._values.setdefault(value, value)
+        if value_type is datetime:
+            # Equal timestamps in different time zones are not interchangeable
+            return self._values.setdefault((value, value.tzinfo), value)
+        if value_type is list:
+            return [self.value(item) for item in value]
+
+        return value
+
+    def attributes(self, data: dict, identifiers: Optional[dict] = None) -> dict:
+        """
+        Return a compacted copy of an attribute dictionary, with the values of the attributes
+        in `identifiers` replaced by the given node identifier objects.
+        """
+        identifiers = identifiers or {}
+        return {
+            (sys.intern(key) if type(key) is str else key): (
+                identifiers[key] if key in identifiers else self.value(value)
+            )
+            for key, value in data.items()
+        }
+
+    def node(self, node_id, data: dict) -> tuple:
+        """
+        Compact a node before it is added to the graph.
+
+        Parameters:
+        -----------
+
+            - node_id: The identifier of the node.
+            - data (dict): The attributes of the node.
+
+        Returns:
+        --------
+
+            - tuple: The identifier and the compacted attributes of the node.
+        """
+        node_id = self.node_id(node_id)
+        data = self.attributes(data)
+        if data.get("id") == node_id:
+            data["id"] = node_id
+        return node_id, data
+
+    def edge(self, source, target, key, data: dict) -> tuple:
+        """
+        Compact an edge before it is added to the graph.
+
+        Parameters:
+        -----------
+
+            - source: The identifier of the source node.
+            - target: The identifier of the target node.
+            - key: The key of the edge, i.e. the relationship name.
+            - data (dict): The attributes of the edge.
+
+        Returns:
+        --------
+
+            - tuple: The endpoints, key and compacted attributes of the edge.
+        """
+        source, target = self.node_id(source), self.node_id(target)
+        data = self.attributes(data)
+        if data.get("source_node_id") == source:
+            data["source_node_id"] = source
+        if data.get("target_node_id") == target:
+            data["target_node_id"] = target
+        return source, target, self.value(key), data
+
+
+def compact_graph(graph: nx.MultiDiGraph) -> None:
+    """
+    Compact the attributes of all nodes and edges of a freshly loaded graph in place.
+
+    The snapshot readers create every node identifier once and use it for the node and all
+    its edges, so only the attribute dictionaries are compacted here.
+
+    Parameters:
+    -----------
+
+        - graph (nx.MultiDiGraph): The graph to compact.
+    """
+    compactor = AttributeCompactor(graph)
+
+    # Rebuilding the attribute dictionaries also drops the space they over-allocated
+    for node_id, data in graph._node.items():
+        attributes = compactor.attributes(data, {"id": node_id})
+        data.clear()
+        data.update(attributes)
+
+    for source, neighbors in graph._succ.items():
+        for target, edges in neighbors.items():
+            compacted_edges = []
+            for key, data in edges.items():
+                attributes = compactor.attributes(
+                    data, {"source_node_id": source, "target_node_id": target}
+                )
+                data.clear()
+                data.update(attributes)
+                compacted_edges.append((compactor.value(key), data))
+
+            # The key dictionaries are shared with the predecessor adjacency
+            edges.clear()
+            edges.update(compacted_edges)
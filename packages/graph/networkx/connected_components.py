@@ -0,0 +1,159 @@
+from typing import Dict, Hashable, List
+
+import networkx as nx
+from scipy.sparse import csgraph
+
+from .graph_metrics import _adjacency_matrix
+
+
+class ComponentIndex:
+    """
+    Weakly connected components of a graph, kept up to date while nodes and edges are added.
+
+    Every component holds the list of its nodes. Joining two components moves the nodes of
+    the smaller one into the larger one (union by size), so a node is moved at most log(n)
+    times and looking up the component of a node is a single dictionary access. Removing
+    nodes or edges can split components, which can't be tracked incrementally, so the owner
+    drops the index then and builds a new one when it is next needed.
+
+    Components are ordered by the position of their first node in the graph, which is the
+    order networkx yields them in.
+    """
+
+    def __init__(self):
+        self.graph = None
+        self._component_of: Dict[Hashable, int] = {}
+        self._members: Dict[int, List] = {}
+        self._first_position: Dict[int, int] = {}
+        self._next_position = 0
+        self._next_component = 0
+        # Component numbers in networkx order, until the components change
+        self._ordered = None
+
+    @classmethod
+    def build(cls, graph: nx.MultiDiGraph) -> "ComponentIndex":
+        """
+        Find the components of all nodes of a graph.
+
+        Parameters:
+        -----------
+
+            - graph (nx.MultiDiGraph): The graph to index.
+
+        Returns:
+        --------
+
+            - ComponentIndex: The component index of the graph.
+        """
+        index = cls()
+        index.graph = graph
+
+        num_nodes = graph.number_of_nodes()
+        if not num_nodes:
+            return index
+
+        # The labels are computed on the sparse adjacency matrix, far faster than a
+        # traversal of the networkx graph
+        count, labels = csgraph.connected_components(
+            _adjacency_matrix(graph), directed=True, connection="weak"
+        )
+
+        labels = labels.tolist()
+        members = [[] for _ in range(count)]
+        first_position = [0] * count
+        for position, (node_id, component) in enumerate(zip(graph, labels)):
+            component_members = members[component]
+            if not component_members:
+                first_position[component] = position
+            component_members.append(node_id)
+
+        index._component_of = dict(zip(graph, labels))
+        index._members = dict(enumerate(members))
+        index._first_position = dict(enumerate(first_position))
+        index._next_position = num_nodes
+        index._next_component = count
+        return index
+
+    def add_node(self, node_id) -> None:
+        """
+        Add a node as a component of its own, nodes that are already indexed are ignored.
+
+        Parameters:
+        -----------
+
+            - node_id: The identifier of the node.
+        """
+        if node_id in self._component_of:
+            return
+
+        component = self._next_component
+        self._next_component += 1
+
+        self._component_of[node_id] = component
+        self._members[component] = [node_id]
+        self._first_position[component] = self._next_position
+        self._next_position += 1
+        self._ordered = None
+
+    def add_edge(self, source, target) -> None:
+        """
+        Join the components of the endpoints of an added edge, adding endpoints that are not
+        indexed yet in the order networkx adds them to the graph.
+
+        Parameters:
+        -----------
+
+            - source: The identifier of the source node.
+            - target: The identifier of the target node.
+        """
+        self.add_node(source)
+        self.add_node(target)
+
+        component, other_component = self._component_of[source], self._component_of[target]
+        if component == other_component:
+            return
+
+        if len(self._members[component]) < len(self._members[other_component]):
+            component, other_component = other_component, component
+
+        moved_nodes = self._members.pop(other_component)
+        component_of = self._component_of
+        for node_id in moved_nodes:
+            component_of[node_id] = component
+        self._members[component].extend(moved_nodes)
+
+        self._first_position[component] = min(
+            self._first_position[component], self._first_position.pop(other_component)
+        )
+        self._ordered = None
+
+    def count(self) -> int:
+        return len(self._members)
+
+    def _ordered_components(self) -> list:
+        if self._ordered is None:
+            self._ordered = sorted(self._members, key=self._first_position.__getitem__)
+        return self._ordered
+
+    def sizes(self) -> List[int]:
+        """
+        Sizes of the components, in the order networkx yields the components.
+        """
+        return [len(self._members[component]) for component in self._ordered_components()]
+
+    def nodes_outside_largest(self) -> list:
+        """
+        Nodes of all components but the largest one, the first in networkx order if several
+        components have the largest size.
+        """
+        components = self._ordered_components()
+        if not components:
+            return []
+
+        largest = max(components, key=lambda component: len(self._members[component]))
+        return [
+            node_id
+            for component in components
+            if component != largest
+            for node_id in self._members[component]
+        ]
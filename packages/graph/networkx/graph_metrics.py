@@ -0,0 +1,224 @@
+from typing import Optional
+
+import numpy as np
+import networkx as nx
+from scipy import sparse
+from scipy.sparse import csgraph
+from cognee.shared.logging_utils import get_logger
+
+logger = get_logger()
+
+# Upper bound for the number of distances held in memory at once while running BFS
+_MAX_DISTANCE_BATCH = 2**24
+
+_CLUSTERING_BATCH_SIZE = 256
+
+
+def _adjacency_matrix(graph: nx.MultiDiGraph) -> sparse.csr_array:
+    # Built straight from the successor dictionaries, which is a few times faster than
+    # nx.to_scipy_sparse_array on large multigraphs since every edge is visited only once.
+    num_nodes = graph.number_of_nodes()
+    node_index = {node: index for index, node in enumerate(graph)}
+    successors = graph._succ
+
+    row_lengths = np.fromiter(
+        (len(neighbors) for neighbors in successors.values()), dtype=np.int64, count=num_nodes
+    )
+    num_entries = int(row_lengths.sum())
+    columns = np.fromiter(
+        (node_index[target] for neighbors in successors.values() for target in neighbors),
+        dtype=np.int64,
+        count=num_entries,
+    )
+    # Parallel edges between the same nodes are stored as their multiplicity
+    multiplicities = np.fromiter(
+        (len(edges) for neighbors in successors.values() for edges in neighbors.values()),
+        dtype=np.int64,
+        count=num_entries,
+    )
+
+    row_offsets = np.zeros(num_nodes + 1, dtype=np.int64)
+    np.cumsum(row_lengths, out=row_offsets[1:])
+    return sparse.csr_array((multiplicities, columns, row_offsets), shape=(num_nodes, num_nodes))
+
+
+class GraphMetrics:
+    """
+    Graph metrics computed on sparse matrix representations of a graph.
+
+    The graph is converted once into a CSR adjacency matrix holding edge multiplicities, from
+    which degrees, self-loops and weakly connected components are derived. Path lengths and
+    clustering are computed on the undirected simple graph without self-loops, the same graph
+    the previous networkx based metrics used. On graphs with more nodes than `sample_size`,
+    those are estimated from a uniform sample of nodes instead of being computed exactly:
+    `sample_size` nodes for the clustering and `path_sample_size` BFS sources for the path
+    lengths, since a single BFS already visits the whole graph.
+    """
+
+    def __init__(
+        self,
+        graph: nx.MultiDiGraph,
+        sample_size: int = 1000,
+        path_sample_size: int = 16,
+        seed=None,
+    ):
+        self.num_nodes = graph.number_of_nodes()
+        self.sample_size = sample_size
+        self.path_sample_size = path_sample_size
+        self._rng = np.random.default_rng(seed)
+
+        self.adjacency = _adjacency_matrix(graph)
+
+        self._undirected = None
+        self._component_labels = None
+
+    @property
+    def undirected(self) -> sparse.csr_array:
+        """
+        Symmetric 0/1 adjacency matrix of the undirected simple graph without self-loops.
+        """
+        if self._undirected is None:
+            symmetric = (self.adjacency + self.adjacency.T).tocoo()
+            off_diagonal = symmetric.row != symmetric.col
+            self._undirected = sparse.csr_array(
+                (
+                    np.ones(np.count_nonzero(off_diagonal), dtype=np.int32),
+                    (symmetric.row[off_diagonal], symmetric.col[off_diagonal]),
+                ),
+                shape=symmetric.shape,
+            )
+        return self._undirected
+
+    def _components(self):
+        if self._component_labels is None:
+            count, labels = csgraph.connected_components(
+                self.adjacency, directed=True, connection="weak"
+            )
+            self._component_count, self._component_labels = count, labels
+        return self._component_count, self._component_labels
+
+    def degrees(self) -> np.ndarray:
+        """
+        In plus out degree of every node, counting parallel edges and self-loops like networkx.
+        """
+        return np.asarray(self.adjacency.sum(axis=0) + self.adjacency.sum(axis=1)).ravel()
+
+    def mean_degree(self) -> float:
+        return float(self.degrees().mean()) if self.num_nodes else 0
+
+    def num_edges(self) -> int:
+        return int(self.adjacency.sum())
+
+    def edge_density(self) -> float:
+        num_possible_edges = self.num_nodes * (self.num_nodes - 1)
+        return self.num_edges() / num_possible_edges if num_possible_edges > 0 else 0
+
+    def num_selfloops(self) -> int:
+        return int(self.adjacency.diagonal().sum())
+
+    def num_connected_components(self) -> int:
+        return self._components()[0]
+
+    def sizes_of_connected_components(self) -> list:
+        """
+        Sizes of the weakly connected components, ordered like the components networkx
+        yields, i.e. by the position of their first node in the graph.
+        """
+        count, labels = self._components()
+        if not count:
+            return []
+
+        first_nodes = np.full(count, self.num_nodes)
+        np.minimum.at(first_nodes, labels, np.arange(self.num_nodes))
+        sizes = np.bincount(labels, minlength=count)
+        return sizes[np.argsort(first_nodes)].tolist()
+
+    def _sample_nodes(self, size: int) -> np.ndarray:
+        if self.num_nodes <= self.sample_size:
+            return np.arange(self.num_nodes)
+        size = min(max(size, 1), self.num_nodes)
+        return np.sort(self._rng.choice(self.num_nodes, size, replace=False))
+
+    def _shortest_path_lengths(self, sources: np.ndarray):
+        batch_size = max(1, _MAX_DISTANCE_BATCH // self.num_nodes)
+        for start in range(0, len(sources), batch_size):
+            yield csgraph.shortest_path(
+                self.undirected,
+                method="D",
+                directed=False,
+                unweighted=True,
+                indices=sources[start : start + batch_size],
+            )
+
+    def _check_connected(self, metric: str) -> bool:
+        if self.num_nodes == 0:
+            logger.warning("Failed to calculate %s: the graph is empty", metric)
+            return False
+        if self.num_connected_components() > 1:
+            logger.warning("Failed to calculate %s: the graph is not connected", metric)
+            return False
+        return True
+
+    def diameter(self) -> Optional[int]:
+        """
+        Longest shortest path of the connected graph, or None if it is not connected.
+
+        With sampling, the largest eccentricity among the sampled nodes is refined by a second
+        BFS from the farthest node found (double sweep), which gives a tight lower bound.
+        """
+        if not self._check_connected("diameter"):
+            return None
+
+        sources = self._sample_nodes(self.path_sample_size)
+        diameter, farthest_node = 0, sources[0]
+        for distances in self._shortest_path_lengths(sources):
+            row, column = np.unravel_index(np.argmax(distances), distances.shape)
+            if distances[row, column] > diameter:
+                diameter, farthest_node = distances[row, column], column
+
+        if len(sources) < self.num_nodes:
+            (distances,) = self._shortest_path_lengths(np.array([farthest_node]))
+            diameter = max(diameter, distances.max())
+
+        return int(diameter)
+
+    def avg_shortest_path_length(self) -> Optional[float]:
+        """
+        Mean shortest path length over all ordered pairs of distinct nodes, estimated from the
+        paths starting at the sampled nodes, or None if the graph is not connected.
+        """
+        if not self._check_connected("average shortest path length"):
+            return None
+        if self.num_nodes == 1:
+            return 0
+
+        sources = self._sample_nodes(self.path_sample_size)
+        total = sum(distances.sum() for distances in self._shortest_path_lengths(sources))
+        return float(total / (len(sources) * (self.num_nodes - 1)))
+
+    def avg_clustering(self) -> Optional[float]:
+        """
+        Mean local clustering coefficient of the undirected graph, estimated from the sampled
+        nodes. Nodes with fewer than two neighbors count as zero, like in networkx.
+        """
+        if self.num_nodes == 0:
+            logger.warning("Failed to calculate clustering coefficient: the graph is empty")
+            return None
+
+        undirected = self.undirected
+        sources = self._sample_nodes(self.sample_size)
+        degrees = np.diff(undirected.indptr)[sources]
+        triangles = np.empty(len(sources), dtype=np.float64)
+
+        for start in range(0, len(sources), _CLUSTERING_BATCH_SIZE):
+            rows = undirected[sources[start : start + _CLUSTERING_BATCH_SIZE]]
+            # Entry (i, j) of rows @ A counts the common neighbors of node i and j, summing it
+            # over the neighbors j of i counts every triangle through i twice.
+            closed = (rows @ undirected).multiply(rows).sum(axis=1)
+            triangles[start : start + len(closed)] = np.asarray(closed).ravel() / 2
+
+        possible = degrees * (degrees - 1) / 2
+        coefficients = np.divide(
+            triangles, possible, out=np.zeros_like(triangles), where=possible > 0
+        )
+        return float(coefficients.mean())
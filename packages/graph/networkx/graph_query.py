@@ -0,0 +1,569 @@
+import re
+import ast
+import operator
+from functools import lru_cache
+from itertools import islice
+from typing import Any, Dict, List, Optional
+from uuid import UUID
+
+import networkx as nx
+
+from .attribute_index import AttributeIndex
+from .graph_serialization import parse_node_id
+
+# A small subset of Cypher evaluated directly on the adjacency of a MultiDiGraph:
+#
+#     MATCH (a:Label {property: value})-[r:TYPE|OTHER]->(b)<-[:TYPE]-(c)
+#     WHERE a.property = $param AND r.property IN [1, 2] AND c.property IS NOT NULL
+#     RETURN a, r.property AS alias, c.name
+#     LIMIT 10
+#
+# Labels match the `type` attribute of nodes and relationship types match edge keys, which
+# hold the relationship name. Patterns have at most two relationships, and conditions are
+# joined with AND and compare a property with a literal or a parameter.
+
+_TOKEN = re.compile(
+    r"""\s*(?:
+        (?P<string>'(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*")
+        |(?P<number>-?\d+(?:\.\d+)?)
+        |(?P<parameter>\$[A-Za-z_]\w*)
+        |(?P<name>[A-Za-z_]\w*|`[^`]+`)
+        |(?P<symbol><-|->|<>|!=|<=|>=|[-()\[\]{}:,.=<>|])
+    )""",
+    re.VERBOSE,
+)
+
+_MAX_RELATIONSHIPS = 2
+
+
+def _equals(value, operand) -> bool:
+    return value == operand
+
+
+def _is_in(value, operand) -> bool:
+    return value in operand
+
+
+def _contains(value, operand) -> bool:
+    return isinstance(value, str) and operand in value
+
+
+def _starts_with(value, operand) -> bool:
+    return isinstance(value, str) and value.startswith(operand)
+
+
+def _ends_with(value, operand) -> bool:
+    return isinstance(value, str) and value.endswith(operand)
+
+
+def _is_null(value, operand) -> bool:
+    return value is None
+
+
+def _is_not_null(value, operand) -> bool:
+    return value is not None
+
+
+_COMPARISONS = {
+    "=": _equals,
+    "<>": operator.ne,
+    "!=": operator.ne,
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+class Parameter:
+    """
+    Reference to a query parameter, resolved when the plan is executed.
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+
+
+class NodePattern:
+    def __init__(self, variable: Optional[str], label: Optional[str], properties: dict):
+        self.variable = variable
+        self.label = label
+        self.properties = properties
+
+
+class RelationshipPattern:
+    def __init__(self, variable: Optional[str], types: Optional[tuple], direction: str):
+        self.variable = variable
+        self.types = types
+        # 'out' for (a)-->(b), 'in' for (a)<--(b) and 'both' for (a)--(b)
+        self.direction = direction
+
+
+def _normalize(value):
+    # Node ids are UUIDs while query parameters usually hold their string form
+    if isinstance(value, UUID):
+        return str(value)
+    if isinstance(value, (list, tuple, set)):
+        return [_normalize(item) for item in value]
+    return value
+
+
+def _matches(filters: list, data: dict) -> bool:
+    for attribute, test, operand in filters:
+        value = data.get(attribute)
+        if isinstance(value, UUID):
+            value = str(value)
+        try:
+            if not test(value, operand):
+                return False
+        except TypeError:
+            # Values of different types are not comparable and never match
+            return False
+    return True
+
+
+class QueryPlan:
+    """
+    A parsed query that is matched against a graph by walking its adjacency.
+
+    The match starts from the node pattern with the fewest candidates according to the node
+    id or the attribute index, and extends to its neighbors one relationship at a time,
+    checking every condition as soon as the node or relationship it refers to is bound.
+    Plans don't depend on parameter values, so a plan can be reused for any parameters.
+    """
+
+    def __init__(
+        self,
+        nodes: List[NodePattern],
+        relationships: List[RelationshipPattern],
+        conditions: list,
+        returns: list,
+        limit,
+    ):
+        self.nodes = nodes
+        self.relationships = relationships
+        self.returns = returns
+        self.limit = limit
+
+        self._variables = {}
+        for kind, patterns in (("node", nodes), ("relationship", relationships)):
+            for position, pattern in enumerate(patterns):
+                if pattern.variable is None:
+                    continue
+                if pattern.variable in self._variables:
+                    raise ValueError(f"Variable '{pattern.variable}' is bound more than once")
+                self._variables[pattern.variable] = (kind, position)
+
+        self._node_conditions = [[] for _ in nodes]
+        self._relationship_conditions = [[] for _ in relationships]
+
+        for position, node in enumerate(nodes):
+            if node.label is not None:
+                self._node_conditions[position].append(("type", _equals, node.label))
+            for attribute, value in node.properties.items():
+                self._node_conditions[position].append((attribute, _equals, value))
+
+        for variable, attribute, test, operand in conditions:
+            kind, position = self._get_variable(variable)
+            if kind == "node":
+                self._node_conditions[position].append((attribute, test, operand))
+            else:
+                self._relationship_conditions[position].append((attribute, test, operand))
+
+        for _, variable, _ in returns:
+            self._get_variable(variable)
+
+    def _get_variable(self, variable: str) -> tuple:
+        if variable not in self._variables:
+            raise ValueError(f"Variable '{variable}' is not defined in the MATCH pattern")
+        return self._variables[variable]
+
+    @staticmethod
+    def _resolve(value, params: dict):
+        if isinstance(value, Parameter):
+            if value.name not in params:
+                raise ValueError(f"Missing query parameter '{value.name}'")
+            value = params[value.name]
+        return _normalize(value)
+
+    def _resolve_filters(self, conditions: list, params: dict) -> list:
+        return [
+            (attribute, test, self._resolve(operand, params))
+            for attribute, test, operand in conditions
+        ]
+
+    def execute(
+        self,
+        graph: nx.MultiDiGraph,
+        attribute_index: Optional[AttributeIndex],
+        params: Optional[dict] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Match the plan against a graph.
+
+        Parameters:
+        -----------
+
+            - graph (nx.MultiDiGraph): The graph to query.
+            - attribute_index (Optional[AttributeIndex]): The attribute index of the graph,
+              if any.
+            - params (Optional[dict]): The values of the query parameters. (default None)
+
+        Returns:
+        --------
+
+            - List[Dict[str, Any]]: One record per match, mapping the returned columns to
+              node or relationship attribute dictionaries or to attribute values.
+        """
+        params = params or {}
+        limit = self._resolve(self.limit, params)
+        if limit is not None and (not isinstance(limit, int) or limit < 0):
+            raise ValueError("LIMIT must be a non-negative integer")
+
+        node_filters = [self._resolve_filters(c, params) for c in self._node_conditions]
+        relationship_filters = [
+            self._resolve_filters(c, params) for c in self._relationship_conditions
+        ]
+
+        matches = self._match(graph, attribute_index, node_filters, relationship_filters)
+        if limit is not None:
+            matches = islice(matches, limit)
+
+        nodes = graph._node
+        records = []
+        for node_ids, edges in matches:
+            record = {}
+            for column, variable, attribute in self.returns:
+                kind, position = self._variables[variable]
+                data = nodes[node_ids[position]] if kind == "node" else edges[position][3]
+                record[column] = data if attribute is None else data.get(attribute)
+            records.append(record)
+
+        return records
+
+    def _choose_start(self, graph, attribute_index, node_filters: list) -> tuple:
+        """
+        Pick the node pattern with the fewest candidate nodes to start matching from.
+        """
+        start, candidates, smallest_count = 0, None, None
+
+        for position, filters in enumerate(node_filters):
+            for attribute, test, operand in filters:
+                if test is _equals:
+                    values = [operand]
+                elif test is _is_in and isinstance(operand, list):
+                    values = operand
+                else:
+                    continue
+
+                if attribute == "id":
+                    # Node ids are looked up directly, as long as they can be hashed
+                    if not all(isinstance(value, (str, int)) for value in values):
+                        continue
+                    count = len(values)
+                elif attribute_index is not None:
+                    count = attribute_index.count(attribute, values)
+                else:
+                    count = None
+
+                if count is not None and (smallest_count is None or count < smallest_count):
+                    start, smallest_count = position, count
+                    if attribute == "id":
+                        candidates = [parse_node_id(value) for value in values]
+                    else:
+                        candidates = attribute_index.lookup(attribute, values)
+
+        if candidates is None:
+            candidates = graph._node
+
+        return start, candidates
+
+    def _walk(self, graph, node_id, position: int, direction: str):
+        types = self.relationships[position].types
+
+        def typed(edges: dict):
+            if types is None:
+                return edges.items()
+            return ((key, edges[key]) for key in types if key in edges)
+
+        if direction in ("out", "both"):
+            for neighbor_id, edges in graph._succ[node_id].items():
+                for key, data in typed(edges):
+                    yield neighbor_id, (node_id, neighbor_id, key, data)
+
+        if direction in ("in", "both"):
+            for neighbor_id, edges in graph._pred[node_id].items():
+                if direction == "both" and neighbor_id == node_id:
+                    # Self-loops were already walked as outgoing edges
+                    continue
+                for key, data in typed(edges):
+                    yield neighbor_id, (neighbor_id, node_id, key, data)
+
+    def _match(self, graph, attribute_index, node_filters: list, relationship_filters: list):
+        nodes = graph._node
+        start, candidates = self._choose_start(graph, attribute_index, node_filters)
+
+        # Relationships are walked from the start node to the end of the pattern, then back
+        # to its beginning against their direction
+        reversed_direction = {"out": "in", "in": "out", "both": "both"}
+        steps = [
+            (position, position, position + 1, relationship.direction)
+            for position, relationship in enumerate(self.relationships)
+            if position >= start
+        ] + [
+            (position + 1, position, position, reversed_direction[relationship.direction])
+            for position, relationship in reversed(list(enumerate(self.relationships)))
+            if position < start
+        ]
+
+        node_ids = [None] * len(self.nodes)
+        edges = [None] * len(self.relationships)
+
+        def extend(step: int):
+            if step == len(steps):
+                yield list(node_ids), list(edges)
+                return
+
+            from_position, position, to_position, direction = steps[step]
+            from_id = node_ids[from_position]
+            for neighbor_id, edge in self._walk(graph, from_id, position, direction):
+                # A relationship is matched at most once per pattern, like in Cypher
+                if any(bound is not None and bound[:3] == edge[:3] for bound in edges):
+                    continue
+                if not _matches(relationship_filters[position], edge[3]):
+                    continue
+                if not _matches(node_filters[to_position], nodes[neighbor_id]):
+                    continue
+
+                node_ids[to_position] = neighbor_id
+                edges[position] = edge
+                yield from extend(step + 1)
+                edges[position] = None
+
+        for node_id in candidates:
+            data = nodes.get(node_id)
+            if data is None or not _matches(node_filters[start], data):
+                continue
+
+            node_ids[start] = node_id
+            yield from extend(0)
+
+
+class _Parser:
+    def __init__(self, query: str):
+        self.query = query
+        self.tokens = []
+
+        position = 0
+        query = query.rstrip().rstrip(";")
+        while position < len(query):
+            match = _TOKEN.match(query, position)
+            if match is None or match.end() == position:
+                raise ValueError(f"Invalid query at position {position}: {self.query!r}")
+            self.tokens.append((match.lastgroup, match.group(match.lastgroup), match.start()))
+            position = match.end()
+            if not query[position:].strip():
+                break
+
+        self.position = 0
+
+    def _error(self, expected: str) -> ValueError:
+        if self.position < len(self.tokens):
+            _, text, offset = self.tokens[self.position]
+            found = f"'{text}' at position {offset}"
+        else:
+            found = "end of query"
+        return ValueError(f"Invalid query, expected {expected} but found {found}")
+
+    def _peek(self, offset: int = 0) -> tuple:
+        if self.position + offset < len(self.tokens):
+            return self.tokens[self.position + offset][:2]
+        return None, None
+
+    def _accept_symbol(self, symbol: str) -> bool:
+        if self._peek() == ("symbol", symbol):
+            self.position += 1
+            return True
+        return False
+
+    def _expect_symbol(self, symbol: str) -> None:
+        if not self._accept_symbol(symbol):
+            raise self._error(f"'{symbol}'")
+
+    def _accept_keyword(self, *keywords: str) -> bool:
+        for offset, keyword in enumerate(keywords):
+            kind, text = self._peek(offset)
+            if kind != "name" or text.upper() != keyword:
+                return False
+        self.position += len(keywords)
+        return True
+
+    def _expect_keyword(self, keyword: str) -> None:
+        if not self._accept_keyword(keyword):
+            raise self._error(keyword)
+
+    def _name(self) -> str:
+        kind, text = self._peek()
+        if kind != "name":
+            raise self._error("a name")
+        self.position += 1
+        return text.strip("`")
+
+    def _value(self):
+        kind, text = self._peek()
+
+        if kind == "string":
+            self.position += 1
+            return ast.literal_eval(text)
+        if kind == "number":
+            self.position += 1
+            return float(text) if "." in text else int(text)
+        if kind == "parameter":
+            self.position += 1
+            return Parameter(text[1:])
+        if kind == "name" and text.upper() in ("TRUE", "FALSE", "NULL"):
+            self.position += 1
+            return {"TRUE": True, "FALSE": False, "NULL": None}[text.upper()]
+        if self._accept_symbol("["):
+            values = []
+            if not self._accept_symbol("]"):
+                values.append(self._literal())
+                while self._accept_symbol(","):
+                    values.append(self._literal())
+                self._expect_symbol("]")
+            return values
+
+        raise self._error("a value")
+
+    def _literal(self):
+        value = self._value()
+        if isinstance(value, Parameter):
+            raise self._error("a literal value")
+        return value
+
+    def _node(self) -> NodePattern:
+        self._expect_symbol("(")
+        variable = self._name() if self._peek()[0] == "name" else None
+        label = self._name() if self._accept_symbol(":") else None
+
+        properties = {}
+        if self._accept_symbol("{"):
+            if not self._accept_symbol("}"):
+                while True:
+                    key = self._name()
+                    self._expect_symbol(":")
+                    properties[key] = self._value()
+                    if not self._accept_symbol(","):
+                        break
+                self._expect_symbol("}")
+
+        self._expect_symbol(")")
+        return NodePattern(variable, label, properties)
+
+    def _relationship(self) -> RelationshipPattern:
+        incoming = self._accept_symbol("<-")
+        if not incoming:
+            self._expect_symbol("-")
+
+        variable, types = None, None
+        if self._accept_symbol("["):
+            variable = self._name() if self._peek()[0] == "name" else None
+            if self._accept_symbol(":"):
+                types = [self._name()]
+                while self._accept_symbol("|"):
+                    self._accept_symbol(":")
+                    types.append(self._name())
+                types = tuple(types)
+            self._expect_symbol("]")
+
+        if self._accept_symbol("->"):
+            if incoming:
+                raise ValueError("Relationships can't point in both directions")
+            direction = "out"
+        else:
+            self._expect_symbol("-")
+            direction = "in" if incoming else "both"
+
+        return RelationshipPattern(variable, types, direction)
+
+    def _condition(self) -> tuple:
+        variable = self._name()
+        self._expect_symbol(".")
+        attribute = self._name()
+
+        kind, text = self._peek()
+        if kind == "symbol" and text in _COMPARISONS:
+            self.position += 1
+            return variable, attribute, _COMPARISONS[text], self._value()
+        if self._accept_keyword("IN"):
+            return variable, attribute, _is_in, self._value()
+        if self._accept_keyword("CONTAINS"):
+            return variable, attribute, _contains, self._value()
+        if self._accept_keyword("STARTS", "WITH"):
+            return variable, attribute, _starts_with, self._value()
+        if self._accept_keyword("ENDS", "WITH"):
+            return variable, attribute, _ends_with, self._value()
+        if self._accept_keyword("IS", "NULL"):
+            return variable, attribute, _is_null, None
+        if self._accept_keyword("IS", "NOT", "NULL"):
+            return variable, attribute, _is_not_null, None
+
+        raise self._error("a comparison")
+
+    def _return_item(self) -> tuple:
+        variable = self._name()
+        attribute = self._name() if self._accept_symbol(".") else None
+        column = f"{variable}.{attribute}" if attribute else variable
+        if self._accept_keyword("AS"):
+            column = self._name()
+        return column, variable, attribute
+
+    def parse(self) -> QueryPlan:
+        self._expect_keyword("MATCH")
+
+        nodes, relationships = [self._node()], []
+        while self._peek() in (("symbol", "-"), ("symbol", "<-")):
+            relationships.append(self._relationship())
+            nodes.append(self._node())
+
+        if len(relationships) > _MAX_RELATIONSHIPS:
+            raise ValueError(
+                f"Patterns with more than {_MAX_RELATIONSHIPS} relationships are not supported"
+            )
+
+        conditions = []
+        if self._accept_keyword("WHERE"):
+            conditions.append(self._condition())
+            while self._accept_keyword("AND"):
+                conditions.append(self._condition())
+
+        self._expect_keyword("RETURN")
+        returns = [self._return_item()]
+        while self._accept_symbol(","):
+            returns.append(self._return_item())
+
+        limit = self._value() if self._accept_keyword("LIMIT") else None
+
+        if self.position < len(self.tokens):
+            raise self._error("end of query")
+
+        return QueryPlan(nodes, relationships, conditions, returns, limit)
+
+
+@lru_cache(maxsize=256)
+def compile_query(query: str) -> QueryPlan:
+    """
+    Parse a query into a reusable plan. Plans are cached by query string, so repeated
+    queries are only parsed once.
+
+    Parameters:
+    -----------
+
+        - query (str): The query to parse.
+
+    Returns:
+    --------
+
+        - QueryPlan: The plan of the query.
+    """
+    return _Parser(query).parse()
@@ -0,0 +1,287 @@
+import gc
+import os
+import re
+import json
+from contextlib import contextmanager
+from datetime import datetime, timezone
+from typing import Optional, Tuple
+from uuid import UUID
+
+import networkx as nx
+from cognee.infrastructure.engine.utils import parse_id
+from cognee.modules.storage.utils import JSONEncoder
+
+from .compact_storage import compact_graph
+from .binary_snapshot import BinarySnapshot, encode_binary_snapshot, is_binary_snapshot
+
+# The functions in this module do the CPU-bound part of saving and loading snapshots. They
+# only operate on their arguments, so they can run in a worker thread or a worker process.
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+
+
+def parse_node_id(node_id):
+    if isinstance(node_id, UUID):
+        return node_id
+    try:
+        return UUID(node_id)
+    except Exception:
+        # If conversion fails, keep the original id
+        return node_id
+
+
+def parse_timestamp(properties: dict) -> None:
+    if isinstance(properties.get("updated_at"), int):  # Handle timestamp in milliseconds
+        properties["updated_at"] = datetime.fromtimestamp(
+            properties["updated_at"] / 1000, tz=timezone.utc
+        )
+    elif isinstance(properties.get("updated_at"), str):
+        # fromisoformat is much faster than strptime and also accepts timestamps
+        # without a fractional part, which isoformat() emits for whole seconds
+        properties["updated_at"] = datetime.fromisoformat(properties["updated_at"])
+
+
+def get_file_stamp(file_path: str) -> Optional[Tuple[int, int]]:
+    """
+    Identify the current version of a file by its modification time and size.
+
+    Parameters:
+    -----------
+
+        - file_path (str): The file to inspect.
+
+    Returns:
+    --------
+
+        - Optional[Tuple[int, int]]: The modification time in nanoseconds and the size of the
+          file, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(file_path)
+    except FileNotFoundError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+@contextmanager
+def _garbage_collection_paused():
+    # Serializing allocates millions of short-lived containers, which keeps triggering full
+    # collections over the whole graph. Those pause every thread, the event loop included.
+    gc_enabled = gc.isenabled()
+    gc.disable()
+    try:
+        yield
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+
+def _decode_json_object(text: str) -> dict:
+    """
+    Decode a JSON object whose array members are decoded one element at a time.
+
+    A single `json.loads` call on a large snapshot holds the GIL until the whole document is
+    decoded, which stalls the event loop even when it runs in a worker thread. Decoding the
+    elements separately gives other threads a chance to run in between.
+    """
+    decoder = json.JSONDecoder()
+
+    def skip_whitespace(position: int) -> int:
+        return _WHITESPACE.match(text, position).end()
+
+    def expect(character: str, position: int) -> int:
+        if text[position : position + 1] != character:
+            raise json.JSONDecodeError(f"Expecting '{character}'", text, position)
+        return skip_whitespace(position + 1)
+
+    result = {}
+    position = expect("{", skip_whitespace(0))
+
+    while text[position : position + 1] != "}":
+        key, position = decoder.raw_decode(text, position)
+        position = expect(":", skip_whitespace(position))
+
+        if text[position : position + 1] == "[":
+            value = []
+            position = skip_whitespace(position + 1)
+            while text[position : position + 1] != "]":
+                item, position = decoder.raw_decode(text, position)
+                value.append(item)
+                position = skip_whitespace(position)
+                if text[position : position + 1] == ",":
+                    position = skip_whitespace(position + 1)
+                elif text[position : position + 1] != "]":
+                    raise json.JSONDecodeError("Expecting ',' or ']'", text, position)
+            position += 1
+        else:
+            value, position = decoder.raw_decode(text, position)
+
+        result[key] = value
+        position = skip_whitespace(position)
+        if text[position : position + 1] == ",":
+            position = skip_whitespace(position + 1)
+        elif text[position : position + 1] != "}":
+            raise json.JSONDecodeError("Expecting ',' or '}'", text, position)
+
+    return result
+
+
+def copy_graph(graph: nx.MultiDiGraph) -> nx.MultiDiGraph:
+    """
+    Copy the structure and the attribute dictionaries of a graph, sharing the attribute
+    values, so the copy can be serialized while the original keeps changing.
+
+    Parameters:
+    -----------
+
+        - graph (nx.MultiDiGraph): The graph to copy.
+
+    Returns:
+    --------
+
+        - nx.MultiDiGraph: The copy.
+    """
+    with _garbage_collection_paused():
+        copy = graph.__class__()
+        copy.graph.update(graph.graph)
+        copy._node.update((node_id, data.copy()) for node_id, data in graph._node.items())
+
+        successors, predecessors = copy._succ, copy._pred
+        for node_id in copy._node:
+            successors[node_id] = {}
+            predecessors[node_id] = {}
+
+        # Both adjacency directions share the same edge dictionaries, like in networkx
+        for source, neighbors in graph._succ.items():
+            source_successors = successors[source]
+            for target, edges in neighbors.items():
+                edges = {key: data.copy() for key, data in edges.items()}
+                source_successors[target] = edges
+                predecessors[target][source] = edges
+
+    return copy
+
+
+def serialize_graph(
+    graph: nx.MultiDiGraph, snapshot_format: str, mutation_log_sequence: int
+) -> bytes:
+    """
+    Encode a graph as a snapshot.
+
+    Parameters:
+    -----------
+
+        - graph (nx.MultiDiGraph): The graph to serialize.
+        - snapshot_format (str): Either 'json' or 'binary'.
+        - mutation_log_sequence (int): The sequence number of the last logged mutation
+          contained in the graph.
+
+    Returns:
+    --------
+
+        - bytes: The encoded snapshot.
+    """
+    with _garbage_collection_paused():
+        if snapshot_format == "binary":
+            return encode_binary_snapshot(graph, mutation_log_sequence)
+
+        graph_data = nx.readwrite.json_graph.node_link_data(graph, edges="links")
+        graph_data["mutation_log_sequence"] = mutation_log_sequence
+        return json.dumps(graph_data, cls=JSONEncoder).encode("utf-8")
+
+
+def write_file_atomically(file_path: str, data: bytes) -> None:
+    """
+    Write a file through a temporary file that replaces the target once it is fully written,
+    so a crash mid-write never leaves a truncated snapshot behind.
+
+    Parameters:
+    -----------
+
+        - file_path (str): The file to write.
+        - data (bytes): The new content of the file.
+    """
+    temp_path = f"{file_path}.tmp"
+
+    with open(temp_path, "wb") as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+
+    os.replace(temp_path, file_path)
+
+
+def read_graph_file(
+    file_path: str, compact: bool = False
+) -> Tuple[nx.MultiDiGraph, int, Optional[Tuple[int, int]]]:
+    """
+    Load a JSON or binary snapshot from disk.
+
+    Parameters:
+    -----------
+
+        - file_path (str): The snapshot file to load.
+        - compact (bool): Whether to share equal attribute values between nodes and edges,
+          see `compact_graph`. (default False)
+
+    Returns:
+    --------
+
+        - Tuple[nx.MultiDiGraph, int, Optional[Tuple[int, int]]]: The graph, the mutation log
+          sequence number stored in the snapshot and the stamp of the file that was read.
+    """
+    # Taken before reading, so a file replaced in the meantime shows up as a changed stamp
+    file_stamp = get_file_stamp(file_path)
+
+    with _garbage_collection_paused():
+        if is_binary_snapshot(file_path):
+            with BinarySnapshot(file_path) as snapshot:
+                graph = snapshot.to_graph()
+                snapshot_sequence = snapshot.mutation_log_sequence
+        else:
+            with open(file_path, "r", encoding="utf-8") as file:
+                graph_data = _decode_json_object(file.read())
+
+            # Edges refer to the parsed node identifiers, so every identifier is parsed once
+            # and all edges of a node share its identifier object
+            parsed_ids = {}
+
+            for node in graph_data["nodes"]:
+                node_id = parse_node_id(node["id"])
+                if isinstance(node["id"], str):
+                    parsed_ids[node["id"]] = node_id
+                node["id"] = node_id
+                parse_timestamp(node)
+
+            for edge in graph_data["links"]:
+                source_id = edge["source"]
+                if not isinstance(source_id, UUID):
+                    source_id = parsed_ids.get(source_id) or parse_id(source_id)
+
+                target_id = edge["target"]
+                if not isinstance(target_id, UUID):
+                    target_id = parsed_ids.get(target_id) or parse_id(target_id)
+
+                edge["source"] = source_id
+                edge["target"] = target_id
+                edge["source_node_id"] = source_id
+                edge["target_node_id"] = target_id
+
+                parse_timestamp(edge)
+
+            graph = nx.readwrite.json_graph.node_link_graph(graph_data, edges="links")
+            snapshot_sequence = graph_data.get("mutation_log_sequence", 0)
+
+            # The graph holds copies of the decoded attributes. Dropping the decoded document
+            # at once would free it in one uninterruptible cascade, so it is emptied piecewise.
+            for items in (graph_data["nodes"], graph_data["links"]):
+                while items:
+                    items.pop()
+
+        for node_id, node_data in graph.nodes(data=True):
+            node_data["id"] = node_id
+
+        if compact:
+            compact_graph(graph)
+
+    return graph, snapshot_sequence, file_stamp
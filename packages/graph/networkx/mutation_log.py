@@ -0,0 +1,293 @@
+import os
+import json
+import asyncio
+from collections import deque
+from typing import Any, Iterator, List, Tuple
+
+from cognee.shared.logging_utils import get_logger
+from cognee.modules.storage.utils import JSONEncoder
+
+logger = get_logger()
+
+
+def encode_items(items: list) -> str:
+    """
+    Encode the items of a mutation as JSON.
+
+    Parameters:
+    -----------
+
+        - items (list): The nodes, edges or identifiers a mutation applies to.
+
+    Returns:
+    --------
+
+        - str: The JSON encoded items.
+    """
+    return json.dumps(items, cls=JSONEncoder)
+
+
+class MutationLog:
+    """
+    Append-only log of graph mutations stored next to the graph snapshot file.
+
+    Every entry is a single JSON line holding a monotonically increasing sequence number,
+    the mutation operation and its items. Entries are staged in memory and written to disk
+    in batches, each batch followed by an fsync, so persisting a mutation costs time
+    proportional to the mutation itself rather than to the size of the graph.
+    """
+
+    def __init__(self, file_path: str):
+        self.file_path = file_path
+        self.sequence = 0
+        self.flushed_sequence = 0
+        self.items_since_compaction = 0
+        self._pending: List[str] = []
+        self._entry_sizes = deque()
+        self._lock = asyncio.Lock()
+
+    def stage(self, operation: str, items: list) -> int:
+        """
+        Encode a mutation and queue it for the next flush.
+
+        Parameters:
+        -----------
+
+            - operation (str): The name of the mutation operation.
+            - items (list): The nodes, edges or identifiers the operation applies to.
+
+        Returns:
+        --------
+
+            - int: The sequence number assigned to the mutation.
+        """
+        return self.stage_encoded(operation, encode_items(items), len(items))
+
+    def stage_encoded(self, operation: str, encoded_items: str, item_count: int) -> int:
+        """
+        Queue a mutation whose items were already encoded with `encode_items`.
+
+        Parameters:
+        -----------
+
+            - operation (str): The name of the mutation operation.
+            - encoded_items (str): The JSON encoded items of the mutation.
+            - item_count (int): The number of encoded items.
+
+        Returns:
+        --------
+
+            - int: The sequence number assigned to the mutation.
+        """
+        self.sequence += 1
+        self._pending.append(
+            f'{{"seq": {self.sequence}, "op": "{operation}", "items": {encoded_items}}}'
+        )
+        self._track_entry(self.sequence, item_count)
+        return self.sequence
+
+    def _track_entry(self, sequence: int, size: int) -> None:
+        self._entry_sizes.append((sequence, size))
+        self.items_since_compaction += size
+
+    async def flush(self) -> None:
+        """
+        Write all staged mutations to the log file and fsync it.
+
+        Concurrent callers are serialized, and a caller whose mutations were already written
+        by an earlier flush returns without touching the file.
+        """
+        async with self._lock:
+            if not self._pending:
+                return
+
+            lines, self._pending = self._pending, []
+            sequence = self.sequence
+
+            try:
+                await asyncio.to_thread(self._append_lines, lines)
+            except Exception:
+                # Keep the mutations staged, so the next flush writes them
+                self._pending[:0] = lines
+                raise
+
+            self.flushed_sequence = sequence
+
+    def flush_pending(self) -> None:
+        """
+        Synchronously write all staged mutations, for when no event loop is left to run
+        `flush`, e.g. when the interpreter exits.
+        """
+        if self._pending:
+            lines, self._pending = self._pending, []
+            self._append_lines(lines)
+            self.flushed_sequence = self.sequence
+
+    def _append_lines(self, lines: List[str]) -> None:
+        file_dir = os.path.dirname(self.file_path)
+        if file_dir and not os.path.exists(file_dir):
+            os.makedirs(file_dir, exist_ok=True)
+
+        data = ("\n".join(lines) + "\n").encode("utf-8")
+
+        with open(self.file_path, "a+b") as file:
+            # A write that failed earlier may have left a partial entry without its newline,
+            # which would swallow the first entry written now
+            end = file.seek(0, os.SEEK_END)
+            if end:
+                file.seek(end - 1)
+                if file.read(1) != b"\n":
+                    data = b"\n" + data
+
+            file.write(data)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def _drop_partial_entry(self) -> None:
+        """
+        Cut off a trailing entry that was only partially written, e.g. because the process
+        crashed mid-write. Entries appended later would otherwise continue its line and be
+        skipped together with it when the log is read.
+        """
+        if not os.path.exists(self.file_path):
+            return
+
+        with open(self.file_path, "r+b") as file:
+            end = file.seek(0, os.SEEK_END)
+            position = end
+
+            # Search backwards for the newline ending the last complete entry
+            while position > 0:
+                chunk_start = max(0, position - 65536)
+                file.seek(chunk_start)
+                newline = file.read(position - chunk_start).rfind(b"\n")
+                if newline != -1:
+                    position = chunk_start + newline + 1
+                    break
+                position = chunk_start
+
+            if position == end:
+                return
+
+            logger.warning(
+                "Dropping incomplete entry at the end of mutation log %s", self.file_path
+            )
+            file.truncate(position)
+            file.flush()
+            os.fsync(file.fileno())
+
+    def read(self, after_sequence: int = 0) -> Iterator[Tuple[int, str, List[Any]]]:
+        """
+        Iterate over the logged mutations newer than the given sequence number.
+
+        A trailing entry that was only partially written (e.g. because the process crashed
+        mid-write) is skipped.
+
+        Parameters:
+        -----------
+
+            - after_sequence (int): Entries with a sequence number lower than or equal to this
+              value are skipped. (default 0)
+
+        Returns:
+        --------
+
+            - Iterator[Tuple[int, str, List[Any]]]: Tuples of (sequence, operation, items).
+        """
+        if not os.path.exists(self.file_path):
+            return
+
+        with open(self.file_path, "r", encoding="utf-8") as file:
+            for line in file:
+                if not line.strip():
+                    continue
+
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning("Skipping incomplete entry in mutation log %s", self.file_path)
+                    continue
+
+                if entry["seq"] > after_sequence:
+                    yield entry["seq"], entry["op"], entry["items"]
+
+    def replay(self, snapshot_sequence: int) -> Iterator[Tuple[str, List[Any]]]:
+        """
+        Iterate over the mutations logged after a snapshot and resume sequence numbering
+        from the last one once the iteration is exhausted.
+
+        Parameters:
+        -----------
+
+            - snapshot_sequence (int): The sequence number stored in the loaded snapshot.
+
+        Returns:
+        --------
+
+            - Iterator[Tuple[str, List[Any]]]: Tuples of (operation, items) in log order.
+        """
+        self._entry_sizes.clear()
+        self.items_since_compaction = 0
+        last_sequence = snapshot_sequence
+
+        # New entries are appended after the replayed ones
+        self._drop_partial_entry()
+
+        for sequence, operation, items in self.read(snapshot_sequence):
+            last_sequence = max(last_sequence, sequence)
+            self._track_entry(sequence, len(items))
+            yield operation, items
+
+        self.sequence = last_sequence
+        self.flushed_sequence = last_sequence
+
+    async def truncate(self, snapshot_sequence: int) -> None:
+        """
+        Drop the entries that are already contained in a snapshot.
+
+        Parameters:
+        -----------
+
+            - snapshot_sequence (int): The sequence number stored in the written snapshot.
+        """
+        async with self._lock:
+            await asyncio.to_thread(self._truncate, snapshot_sequence)
+
+            while self._entry_sizes and self._entry_sizes[0][0] <= snapshot_sequence:
+                self.items_since_compaction -= self._entry_sizes.popleft()[1]
+
+    def _truncate(self, snapshot_sequence: int) -> None:
+        if not os.path.exists(self.file_path):
+            return
+
+        if self.flushed_sequence <= snapshot_sequence:
+            os.remove(self.file_path)
+            return
+
+        temp_path = f"{self.file_path}.tmp"
+        with open(self.file_path, "r", encoding="utf-8") as source:
+            with open(temp_path, "w", encoding="utf-8") as target:
+                for line in source:
+                    try:
+                        if json.loads(line)["seq"] > snapshot_sequence:
+                            target.write(line)
+                    except json.JSONDecodeError:
+                        continue
+                target.flush()
+                os.fsync(target.fileno())
+
+        os.replace(temp_path, self.file_path)
+
+    async def delete(self) -> None:
+        """
+        Remove the log file and reset the sequence numbering.
+        """
+        async with self._lock:
+            self._pending = []
+            self.sequence = 0
+            self.flushed_sequence = 0
+            self.items_since_compaction = 0
+            self._entry_sizes.clear()
+
+            if os.path.exists(self.file_path):
+                await asyncio.to_thread(os.remove, self.file_path)
@@ -1,13 +1,18 @@
 from datetime import datetime, timezone
 import os
-import json
+import re
+import atexit
 import asyncio
+from contextlib import asynccontextmanager, contextmanager
+from collections import OrderedDict
+from contextvars import ContextVar
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from functools import wraps
+from itertools import islice
 
-from cognee.infrastructure.databases.exceptions.exceptions import NodesetFilterNotSupportedError
 from cognee.shared.logging_utils import get_logger
-from typing import Dict, Any, List, Union, Type, Tuple
+from typing import AsyncIterator, Dict, Any, Iterator, List, Optional, Sequence, Union, Type, Tuple
 from uuid import UUID
-import aiofiles
 import aiofiles.os as aiofiles_os
 import networkx as nx
 from cognee.infrastructure.databases.graph.graph_db_interface import (
@@ -16,24 +21,275 @@ from cognee.infrastructure.databases.graph.graph_db_interface import (
 )
 from cognee.infrastructure.engine import DataPoint
 from cognee.infrastructure.engine.utils import parse_id
-from cognee.modules.storage.utils import JSONEncoder
-import numpy as np
+
+from .attribute_index import AttributeIndex
+from .compact_storage import AttributeCompactor
+from .connected_components import ComponentIndex
+from .graph_metrics import GraphMetrics
+from .graph_query import compile_query
+from .graph_serialization import (
+    copy_graph,
+    get_file_stamp,
+    parse_node_id,
+    parse_timestamp,
+    read_graph_file,
+    serialize_graph,
+    write_file_atomically,
+)
+from .mutation_log import MutationLog, encode_items
+from .read_write_lock import ReadWriteLock
 
 logger = get_logger()
 
+_active_batch = ContextVar("networkx_adapter_batch", default=None)
+_active_dataset = ContextVar("networkx_adapter_dataset", default=None)
+
+_DEFAULT_GRAPH_FILENAME = "cognee_graph.pkl"
+# Dataset names become file names
+_DATASET_NAME = re.compile(r"[A-Za-z0-9_.-]+")
+
+
+def _deserialize_logged_items(operation: str, items: list) -> list:
+    """
+    Convert mutation log items decoded from JSON back into graph identifiers and properties,
+    mirroring the conversions applied when loading a snapshot.
+    """
+    if operation == "add_nodes":
+        nodes = []
+        for node_id, properties in items:
+            node_id = parse_node_id(node_id)
+            properties["id"] = node_id
+            parse_timestamp(properties)
+            nodes.append((node_id, properties))
+        return nodes
+
+    if operation == "add_edges":
+        edges = []
+        for source, target, key, properties in items:
+            source_id = parse_id(source)
+            target_id = parse_id(target)
+            properties["source_node_id"] = source_id
+            properties["target_node_id"] = target_id
+            parse_timestamp(properties)
+            edges.append((source_id, target_id, key, properties))
+        return edges
+
+    if operation == "remove_nodes":
+        return [parse_node_id(node_id) for node_id in items]
+
+    if operation == "remove_edges":
+        return [(parse_id(source), parse_id(target), key) for source, target, key in items]
+
+    raise ValueError(f"Unknown graph mutation: {operation}")
+
+
+def _edge_node_id(node_id, edge, parsed_ids: dict):
+    """
+    Return the key of the node an edge endpoint refers to. Nodes are keyed by UUID, so
+    identifiers given as UUID strings are parsed like loading the graph from disk parses them,
+    otherwise an edge would connect new nodes keyed by the strings.
+    """
+    if isinstance(node_id, UUID):
+        return node_id
+    if isinstance(node_id, str):
+        # Node identifiers repeat across the edges of a batch, each one is parsed once
+        parsed_id = parsed_ids.get(node_id)
+        if parsed_id is None:
+            parsed_id = parsed_ids[node_id] = parse_node_id(node_id)
+        return parsed_id
+    raise ValueError(f"First three elements of edge must be strings or UUIDs: {edge}")
+
+
+def _edges_with_node_keys(edges: list) -> list:
+    """
+    Return (source, target, key, data) edges with their endpoints replaced by node keys, see
+    `_edge_node_id`. The list itself is returned if all endpoints are keys already.
+    """
+    if all(type(source) is not str and type(target) is not str for source, target, _, _ in edges):
+        return edges
+
+    parsed_ids = {}
+    keyed_edges = []
+    for edge in edges:
+        source, target, key, data = edge
+        keyed_edges.append(
+            (
+                _edge_node_id(source, edge, parsed_ids),
+                _edge_node_id(target, edge, parsed_ids),
+                key,
+                data,
+            )
+        )
+    return keyed_edges
+
+
+def _remove_edges(graph: nx.MultiDiGraph, edges: list) -> None:
+    """
+    Remove (source, target, key) edges like `remove_edges_from`, ignoring missing edges, but
+    directly on the adjacency dictionaries instead of through one `remove_edge` call per edge.
+    """
+    successors, predecessors = graph._succ, graph._pred
+
+    for source, target, key in edges:
+        neighbors = successors.get(source)
+        keys = neighbors.get(target) if neighbors is not None else None
+        if keys is None or key not in keys:
+            continue
+
+        # The key dictionary is shared with the predecessor adjacency
+        del keys[key]
+        if not keys:
+            del neighbors[target]
+            del predecessors[target][source]
+
+    nx._clear_cache(graph)
+
+
+def _reads_graph(method):
+    """
+    Run an adapter method while holding the graph lock shared with other readers.
+    """
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        await self._ensure_graph_loaded()
+        async with self._graph_lock.read():
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+def _writes_graph(method):
+    """
+    Run an adapter method while holding the graph lock exclusively.
+    """
+
+    @wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        async with self._graph_lock.write():
+            return await method(self, *args, **kwargs)
+
+    return wrapper
+
+
+class _MutationBatch:
+    """
+    Mutations collected inside `NetworkXAdapter.batch` until they are persisted, together
+    with the inverse mutations needed to roll them back.
+    """
+
+    def __init__(self, shard):
+        self.shard = shard
+        self.operations = []
+        self.undo = []
+
+
+class _GraphShard:
+    """
+    The in-memory graph of a dataset together with its files and the state tracking them.
+    """
+
+    def __init__(self, filename: str):
+        self.filename = filename
+        self.graph = None
+        self._mutation_log = MutationLog(f"{filename}.wal")
+        self._compaction_task = None
+        # Writes the staged mutations once `flush_interval` has passed
+        self._flush_task = None
+        self._graph_lock = ReadWriteLock()
+        # Serializes snapshot writes so they reach the disk in sequence order
+        self._snapshot_lock = asyncio.Lock()
+        self._attribute_index = None
+        # Built on first use, dropped when nodes or edges are removed
+        self._component_index = None
+        # Incremented whenever the in-memory graph changes
+        self._generation = 0
+        # Modification time and size of the snapshot and log files the in-memory graph matches
+        self._disk_stamp = None
+        self._file_writes_in_progress = 0
+        self._graph_data_cache = None
+
+    @property
+    def size(self) -> int:
+        return self.graph.number_of_nodes() + self.graph.number_of_edges()
+
+    def is_idle(self) -> bool:
+        """
+        Whether the graph is neither used nor has changes that are not yet on disk.
+        """
+        return (
+            not self._graph_lock.in_use
+            and not self._snapshot_lock.locked()
+            and self._file_writes_in_progress == 0
+            and (self._compaction_task is None or self._compaction_task.done())
+            and self._mutation_log.flushed_sequence == self._mutation_log.sequence
+        )
+
+    def unload(self) -> None:
+        self.graph = None
+        self._attribute_index = None
+        self._component_index = None
+        self._graph_data_cache = None
+        self._disk_stamp = None
+        self._generation += 1
+
+
+class _ShardAttribute:
+    """
+    Adapter attribute stored on the graph shard of the dataset used by the current context.
+    """
+
+    def __set_name__(self, owner, name):
+        self.name = name
+
+    def __get__(self, adapter, owner=None):
+        if adapter is None:
+            return self
+        return getattr(adapter._get_shard(), self.name)
+
+    def __set__(self, adapter, value):
+        setattr(adapter._get_shard(), self.name, value)
+
 
 class NetworkXAdapter(GraphDBInterface):
     """
     Manage a singleton instance of a graph database interface, utilizing the NetworkX
     library. Handles graph data access and manipulation, including nodes and edges
     management, persistence, and auxiliary functionalities.
+
+    The shared graph is guarded by a reader/writer lock: mutations take it exclusively,
+    while readers and snapshot serialization share it. Disk writes always happen after the
+    lock is released, so readers never wait for file I/O.
+
+    Every dataset selected with `use_dataset` has its own graph, files and lock (a shard),
+    the default graph is used outside of it. The attributes below resolve to the shard of
+    the current context.
     """
 
     _instance = None
-    graph = None  # Class variable to store the singleton instance
+    _shards = None
+    graph = _ShardAttribute()
+    filename = _ShardAttribute()
+    _mutation_log = _ShardAttribute()
+    _compaction_task = _ShardAttribute()
+    _flush_task = _ShardAttribute()
+    _graph_lock = _ShardAttribute()
+    _snapshot_lock = _ShardAttribute()
+    _attribute_index = _ShardAttribute()
+    _component_index = _ShardAttribute()
+    _generation = _ShardAttribute()
+    _disk_stamp = _ShardAttribute()
+    _file_writes_in_progress = _ShardAttribute()
+    _graph_data_cache = _ShardAttribute()
+    _executor = None
+    _executor_kind = None
+    graph_data_cache_hits = 0
+    graph_data_cache_misses = 0
 
     #:TODO: Since networkx is not a real database these params dont make sense but they are needed for now because of cognee third party graph db interface handling. We have to find a better solution
-    def __new__(cls, graph_database_url, graph_database_username, graph_database_password):
+    def __new__(
+        cls, graph_database_url, graph_database_username, graph_database_password, **kwargs
+    ):
         if cls._instance is None:
             cls._instance = super().__new__(cls)
             cls._instance.graph_database_url = graph_database_url
@@ -43,37 +299,708 @@ class NetworkXAdapter(GraphDBInterface):
 
     def __init__(self, graph_database_url=None,
                  graph_database_username=None,
-                 graph_database_password=None,):
-        self.filename = "cognee_graph.pkl"
+                 graph_database_password=None,
+                 mutation_log_compaction_threshold: int = 50000,
+                 snapshot_format: str = "json",
+                 serialization_executor: str = "thread",
+                 indexed_attributes: Tuple[str, ...] = ("type", "name"),
+                 compact_storage: bool = False,
+                 dataset_directory: str = "cognee_graphs",
+                 max_loaded_graph_size: Optional[int] = None,
+                 flush_interval: Optional[float] = None,
+                 flush_max_mutations: int = 1000,):
+        if snapshot_format not in ("json", "binary"):
+            raise ValueError("snapshot_format must be either 'json' or 'binary'")
+        if serialization_executor not in ("thread", "process"):
+            raise ValueError("serialization_executor must be either 'thread' or 'process'")
+
         self.graph_database_url = graph_database_url
         self.graph_database_username = graph_database_username
         self.graph_database_password = graph_database_password
+        # Number of logged node/edge changes after which the mutation log is compacted
+        # into a fresh snapshot in the background.
+        self.mutation_log_compaction_threshold = mutation_log_compaction_threshold
+        # Format used when writing snapshots, existing files are detected automatically on load
+        self.snapshot_format = snapshot_format
+        # Where snapshots are encoded and decoded, so large graphs don't block the event loop
+        self.serialization_executor = serialization_executor
+        # Node attributes with an in-memory hash index, an empty tuple disables indexing
+        self.indexed_attributes = tuple(indexed_attributes or ())
+        # Share equal attribute values between nodes and edges to reduce memory usage
+        self.compact_storage = compact_storage
+        # Where the graph files of the datasets selected with `use_dataset` are stored
+        self.dataset_directory = dataset_directory
+        # Total number of nodes and edges above which the least recently used dataset graphs
+        # are unloaded, None keeps all of them in memory
+        self.max_loaded_graph_size = max_loaded_graph_size
+        # Seconds for which mutations may stay staged in memory before they are written to the
+        # mutation log, None writes every mutation right away. Once `flush_max_mutations`
+        # mutations are staged, they are written without waiting for the interval.
+        self.flush_interval = flush_interval
+        self.flush_max_mutations = flush_max_mutations
+
+        if self._shards is None:
+            # Ordered from the least to the most recently used
+            self._shards = OrderedDict()
+            atexit.register(self._flush_at_exit)
+
+    def _get_shard(self) -> _GraphShard:
+        dataset = _active_dataset.get()
+        shard = self._shards.get(dataset)
+
+        if shard is None:
+            if dataset is None:
+                filename = _DEFAULT_GRAPH_FILENAME
+            else:
+                filename = os.path.join(self.dataset_directory, f"{dataset}.pkl")
+            shard = self._shards[dataset] = _GraphShard(filename)
+        else:
+            self._shards.move_to_end(dataset)
+
+        return shard
+
+    @contextmanager
+    def use_dataset(self, dataset_id: Union[str, UUID]):
+        """
+        Use the graph of a dataset for all adapter calls made in the block, including tasks
+        started from it.
+
+        Every dataset is stored in its own files in `dataset_directory` and loaded on first
+        use, so working with one dataset never loads or rewrites the graphs of the others.
+
+        Usage:
+        ------
+
+            with adapter.use_dataset(dataset_id):
+                await adapter.add_nodes(nodes)
+
+        Parameters:
+        -----------
+
+            - dataset_id (Union[str, UUID]): The identifier or name of the dataset.
+        """
+        dataset = str(dataset_id)
+        if not _DATASET_NAME.fullmatch(dataset) or dataset in (".", ".."):
+            raise ValueError(f"Invalid dataset name for a graph file: {dataset!r}")
+
+        token = _active_dataset.set(dataset)
+        try:
+            yield self
+        finally:
+            _active_dataset.reset(token)
+
+    def _unload_idle_graphs(self) -> None:
+        """
+        Unload the least recently used dataset graphs until the loaded graphs fit into
+        `max_loaded_graph_size`. Graphs that are in use or have unsaved changes are kept, and
+        unloaded graphs are loaded again from their files when they are used next.
+        """
+        if self.max_loaded_graph_size is None:
+            return
+
+        current_shard = self._get_shard()
+        loaded_shards = [shard for shard in self._shards.values() if shard.graph is not None]
+        loaded_size = sum(shard.size for shard in loaded_shards)
+
+        for shard in loaded_shards:
+            if loaded_size <= self.max_loaded_graph_size:
+                break
+            if shard is current_shard or not shard.is_idle():
+                continue
+
+            loaded_size -= shard.size
+            shard.unload()
+            logger.debug("Unloaded graph %s from memory", shard.filename)
+
+    async def _ensure_graph_loaded(self) -> None:
+        if self.graph is None:
+            await self.load_graph_from_file()
+
+    async def _run_in_executor(self, function, *args):
+        """
+        Run a CPU-bound serialization function in the configured thread or process pool.
+        """
+        if self._executor is None or self._executor_kind != self.serialization_executor:
+            if self._executor is not None:
+                self._executor.shutdown(wait=False)
+
+            if self.serialization_executor == "process":
+                self._executor = ProcessPoolExecutor(max_workers=1)
+            else:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=1, thread_name_prefix="networkx-serialization"
+                )
+            self._executor_kind = self.serialization_executor
+
+        return await asyncio.get_running_loop().run_in_executor(self._executor, function, *args)
+
+    def _get_disk_stamp(self) -> tuple:
+        return get_file_stamp(self.filename), get_file_stamp(self._mutation_log.file_path)
+
+    @contextmanager
+    def _writing_graph_files(self):
+        """
+        Mark the graph files as being written by this adapter and record their new stamp once
+        done, so the changes don't look like they were made by another process.
+        """
+        self._file_writes_in_progress += 1
+        try:
+            yield
+        finally:
+            self._file_writes_in_progress -= 1
+            self._disk_stamp = self._get_disk_stamp()
+
+    def _graph_files_changed(self) -> bool:
+        """
+        Check whether the graph files were modified since the in-memory graph was loaded or
+        last written, which means another process changed them.
+        """
+        if self._file_writes_in_progress:
+            return False
+        return self._get_disk_stamp() != self._disk_stamp
+
+    def _get_attribute_index(self) -> Optional[AttributeIndex]:
+        """
+        Return the attribute index of the current graph, (re)building it if the graph was
+        replaced since it was built.
+        """
+        if not self.indexed_attributes or self.graph is None:
+            return None
+
+        index = self._attribute_index
+        if (
+            index is None
+            or index.graph is not self.graph
+            or index.attributes != self.indexed_attributes
+        ):
+            index = self._attribute_index = AttributeIndex.build(
+                self.graph, self.indexed_attributes
+            )
+        return index
+
+    async def _get_component_index(self) -> ComponentIndex:
+        """
+        Return the component index of the current graph, building it in a worker thread if
+        there is none since the graph was loaded or nodes or edges were removed. The caller
+        has to hold the graph lock, so the graph doesn't change while it is built.
+        """
+        index = self._component_index
+        if index is None or index.graph is not self.graph:
+            index = self._component_index = await asyncio.to_thread(
+                ComponentIndex.build, self.graph
+            )
+        return index
+
+    async def _index_graph(self, graph: nx.MultiDiGraph) -> Optional[AttributeIndex]:
+        """
+        Build the attribute index of a graph that is about to be loaded in a worker thread.
+        """
+        if not self.indexed_attributes:
+            return None
+        return await asyncio.to_thread(AttributeIndex.build, graph, self.indexed_attributes)
+
+    def _find_nodes(self, where_clauses: List[Tuple[str, list]]) -> list:
+        """
+        Find the nodes whose attributes match all given clauses.
+
+        The candidates are taken from the smallest index bucket among the indexed attributes,
+        so the cost is proportional to the result rather than to the graph. Without an indexed
+        attribute among the clauses, all nodes are scanned.
+
+        Parameters:
+        -----------
+
+            - where_clauses (List[Tuple[str, list]]): (attribute, accepted values) pairs.
+
+        Returns:
+        --------
+
+            - list: The identifiers of the matching nodes.
+        """
+        nodes = self.graph.nodes
+        candidates = None
+
+        index = self._get_attribute_index()
+        if index is not None:
+            smallest_clause, smallest_count = None, None
+            for attribute, values in where_clauses:
+                count = index.count(attribute, values)
+                if count is not None and (smallest_count is None or count < smallest_count):
+                    smallest_clause, smallest_count = (attribute, values), count
+
+            if smallest_clause is not None:
+                candidates = index.lookup(*smallest_clause)
+
+        if candidates is None:
+            return [
+                node_id
+                for node_id, data in nodes(data=True)
+                if all(data.get(attribute) in values for attribute, values in where_clauses)
+            ]
+
+        return [
+            node_id
+            for node_id in candidates
+            if all(nodes[node_id].get(attribute) in values for attribute, values in where_clauses)
+        ]
+
+    def _apply_mutation(self, operation: str, items: list) -> None:
+        """
+        Apply a single mutation to the in-memory graph and keep the attribute index in sync.
+
+        Parameters:
+        -----------
+
+            - operation (str): One of 'add_nodes', 'add_edges', 'remove_nodes' or
+              'remove_edges'.
+            - items (list): The nodes, edges or identifiers the operation applies to.
+        """
+        self._generation += 1
+
+        index = self._attribute_index
+        if index is not None and index.graph is not self.graph:
+            # An index of a replaced graph is rebuilt when it is next used
+            index = None
+
+        components = self._component_index
+        if components is not None and components.graph is not self.graph:
+            components = None
+
+        if self.compact_storage and operation in ("add_nodes", "add_edges"):
+            compactor = AttributeCompactor(self.graph)
+            if operation == "add_nodes":
+                items = [compactor.node(node_id, data) for node_id, data in items]
+            else:
+                items = [compactor.edge(*edge) for edge in items]
+
+        if operation == "add_nodes":
+            self.graph.add_nodes_from(items)
+            if index is not None:
+                nodes = self.graph.nodes
+                for node_id, _ in items:
+                    index.add_node(node_id, nodes[node_id])
+            if components is not None:
+                for node_id, _ in items:
+                    components.add_node(node_id)
+        elif operation == "add_edges":
+            items = _edges_with_node_keys(items)
+            self.graph.add_edges_from(items)
+            if components is not None:
+                for source, target, _, _ in items:
+                    components.add_edge(source, target)
+            if index is not None:
+                nodes = self.graph.nodes
+                for source, target, _, _ in items:
+                    # Endpoints that were added implicitly by the edge
+                    if source not in index:
+                        index.add_node(source, nodes[source])
+                    if target not in index:
+                        index.add_node(target, nodes[target])
+        elif operation == "remove_nodes":
+            self.graph.remove_nodes_from(items)
+            # Removals may split components, the index is rebuilt when it is next used
+            self._component_index = None
+            if index is not None:
+                for node_id in items:
+                    index.remove_node(node_id)
+        elif operation == "remove_edges":
+            _remove_edges(self.graph, items)
+            self._component_index = None
+        elif operation == "restore_nodes":
+            for node_id, attributes in items:
+                node_data = self.graph.nodes[node_id]
+                node_data.clear()
+                node_data.update(attributes)
+                if index is not None:
+                    index.add_node(node_id, node_data)
+        elif operation == "restore_edges":
+            for source, target, key, attributes in items:
+                edge_data = self.graph.edges[source, target, key]
+                edge_data.clear()
+                edge_data.update(attributes)
+        else:
+            raise ValueError(f"Unknown graph mutation: {operation}")
+
+    def _get_undo_mutations(self, operation: str, items: list) -> list:
+        """
+        Build the mutations that revert a mutation which is about to be applied.
+
+        Parameters:
+        -----------
+
+            - operation (str): The mutation operation, see `_apply_mutation`.
+            - items (list): The nodes, edges or identifiers the operation applies to.
+
+        Returns:
+        --------
+
+            - list: (operation, items) tuples that restore the current state when applied in
+              reverse order.
+        """
+        graph = self.graph
+
+        if operation == "add_nodes":
+            added_nodes, previous_nodes = [], []
+            for node_id, _ in items:
+                if graph.has_node(node_id):
+                    previous_nodes.append((node_id, dict(graph.nodes[node_id])))
+                else:
+                    added_nodes.append(node_id)
+            return [("restore_nodes", previous_nodes), ("remove_nodes", added_nodes)]
+
+        if operation == "add_edges":
+            added_nodes, added_edges, previous_edges = set(), [], []
+            for source, target, key, _ in items:
+                added_nodes.update(
+                    node_id for node_id in (source, target) if not graph.has_node(node_id)
+                )
+                if graph.has_edge(source, target, key):
+                    previous_edges.append(
+                        (source, target, key, dict(graph.edges[source, target, key]))
+                    )
+                else:
+                    added_edges.append((source, target, key))
+            return [
+                ("remove_nodes", list(added_nodes)),
+                ("restore_edges", previous_edges),
+                ("remove_edges", added_edges),
+            ]
+
+        if operation == "remove_nodes":
+            nodes, successors, predecessors = graph._node, graph._succ, graph._pred
+            node_ids = dict.fromkeys(node_id for node_id in items if node_id in nodes)
+            removed_nodes = [(node_id, dict(nodes[node_id])) for node_id in node_ids]
+            removed_edges = []
+
+            for node_id in node_ids:
+                for target, edges in successors[node_id].items():
+                    removed_edges.extend(
+                        (node_id, target, key, dict(data)) for key, data in edges.items()
+                    )
+                for source, edges in predecessors[node_id].items():
+                    # Edges between two removed nodes were collected as outgoing edges
+                    if source not in node_ids:
+                        removed_edges.extend(
+                            (source, node_id, key, dict(data)) for key, data in edges.items()
+                        )
+            return [("add_edges", removed_edges), ("add_nodes", removed_nodes)]
+
+        if operation == "remove_edges":
+            successors = graph._succ
+            removed_edges = []
+            for source, target, key in items:
+                data = successors.get(source, {}).get(target, {}).get(key)
+                if data is not None:
+                    removed_edges.append((source, target, key, dict(data)))
+            return [("add_edges", removed_edges)]
+
+        raise ValueError(f"Unknown graph mutation: {operation}")
+
+    @asynccontextmanager
+    async def batch(self):
+        """
+        Group mutations so that they are persisted together.
+
+        Mutations made inside the context are applied to the in-memory graph right away but
+        are written to the mutation log in a single fsynced write when the context exits. If
+        the context exits with an exception, the mutations are rolled back instead and
+        nothing is persisted. Nested batches join the outermost one.
+
+        Usage:
+        ------
+
+            async with adapter.batch():
+                await adapter.add_nodes(nodes)
+                await adapter.add_edges(edges)
+        """
+        if _active_batch.get() is not None:
+            yield self
+            return
+
+        await self._ensure_graph_loaded()
+        batch = _MutationBatch(self._get_shard())
+
+        # The batch is a single write: other writers and readers wait until it completes or
+        # is rolled back, so they never observe or interleave with a partial batch.
+        async with self._graph_lock.write():
+            token = _active_batch.set(batch)
+
+            try:
+                yield self
+            except BaseException:
+                for operation, items in reversed(batch.undo):
+                    self._apply_mutation(operation, items)
+                raise
+            finally:
+                _active_batch.reset(token)
+
+            for operation, encoded_items, item_count in batch.operations:
+                self._mutation_log.stage_encoded(operation, encoded_items, item_count)
+
+        if batch.operations:
+            await self._persist_mutations()
+
+    async def _commit_mutation(self, operation: str, items: list) -> None:
+        """
+        Apply a mutation to the in-memory graph and append it to the mutation log.
+
+        Only the mutation itself is written and fsynced; the full graph snapshot is rewritten
+        by a background compaction once enough changes have accumulated in the log. Inside
+        `batch` the mutation is only recorded and persisted when the batch completes.
+
+        Parameters:
+        -----------
+
+            - operation (str): The mutation operation, see `_apply_mutation`.
+            - items (list): The nodes, edges or identifiers the operation applies to.
+        """
+        batch = _active_batch.get()
+
+        if batch is not None:
+            if batch.shard is not self._get_shard():
+                raise RuntimeError("A batch can't change the graphs of several datasets")
+            batch.undo.extend(self._get_undo_mutations(operation, items))
+            self._apply_mutation(operation, items)
+            batch.operations.append((operation, encode_items(items), len(items)))
+            return
+
+        await self._ensure_graph_loaded()
+
+        # Staging under the lock keeps the log in the same order as the applied mutations
+        async with self._graph_lock.write():
+            self._apply_mutation(operation, items)
+            self._mutation_log.stage(operation, items)
+
+        await self._persist_mutations()
+
+    async def _persist_mutations(self) -> None:
+        """
+        Flush the staged mutations to the mutation log, or leave them to the background flush
+        if `flush_interval` is set, and start a background compaction once enough changes
+        have accumulated.
+        """
+        mutation_log = self._mutation_log
+        staged_mutations = mutation_log.sequence - mutation_log.flushed_sequence
+
+        if self.flush_interval is None or staged_mutations >= self.flush_max_mutations:
+            await self._flush_mutation_log()
+        elif self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush_after_interval())
+
+        if self._mutation_log.items_since_compaction >= self.mutation_log_compaction_threshold and (
+            self._compaction_task is None or self._compaction_task.done()
+        ):
+            self._compaction_task = asyncio.create_task(self.compact_graph_file())
+
+    async def _flush_mutation_log(self) -> None:
+        with self._writing_graph_files():
+            await self._mutation_log.flush()
+
+    async def _flush_after_interval(self) -> None:
+        # Mutations staged while a flush is writing see this task still running and don't
+        # start another one, so it keeps flushing until nothing is left staged
+        while self._mutation_log.sequence > self._mutation_log.flushed_sequence:
+            await asyncio.sleep(self.flush_interval)
+
+            try:
+                await self._flush_mutation_log()
+            except Exception as error:
+                # The mutations stay staged and are retried after the next interval
+                logger.error("Failed to flush graph mutation log: %s", error)
+
+    async def flush(self) -> None:
+        """
+        Write the mutations of all dataset graphs that are still staged in memory to their
+        mutation logs.
+        """
+        for dataset, shard in list(self._shards.items()):
+            if shard._mutation_log.flushed_sequence == shard._mutation_log.sequence:
+                continue
+
+            token = _active_dataset.set(dataset)
+            try:
+                await self._flush_mutation_log()
+            finally:
+                _active_dataset.reset(token)
+
+    async def close(self) -> None:
+        """
+        Flush all staged mutations and wait for running compactions, e.g. before the
+        application shuts down. The adapter can still be used afterwards.
+        """
+        await self.flush()
+
+        compaction_tasks = [
+            shard._compaction_task
+            for shard in self._shards.values()
+            if shard._compaction_task is not None
+        ]
+        await asyncio.gather(*compaction_tasks)
+
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def _flush_at_exit(self) -> None:
+        # Staged mutations must not be lost when the process exits without calling `close`
+        for shard in self._shards.values():
+            try:
+                shard._mutation_log.flush_pending()
+            except Exception as error:
+                logger.error("Failed to flush graph mutation log %s: %s", shard.filename, error)
+
+    async def compact_graph_file(self) -> None:
+        """
+        Write a fresh snapshot of the graph and drop the mutation log entries it contains.
+        """
+        try:
+            with self._writing_graph_files():
+                snapshot_sequence = await self.save_graph_to_file(self.filename)
+                await self._mutation_log.truncate(snapshot_sequence)
+        except Exception as error:
+            logger.error("Failed to compact graph mutation log: %s", error)
 
 
     async def get_graph_data(self):
         """
         Retrieve graph data including nodes and edges.
 
+        The graph is only reloaded from disk if the graph files were modified by another
+        process, and the node and edge lists are reused until the graph changes. Reloads are
+        counted in `graph_data_cache_misses`, calls served from memory in
+        `graph_data_cache_hits`.
+
         Returns:
         --------
 
             A tuple containing a list of node data and a list of edge data.
         """
-        await self.load_graph_from_file()
-        return (list(self.graph.nodes(data=True)), list(self.graph.edges(data=True, keys=True)))
+        await self._reload_if_changed()
+
+        async with self._graph_lock.read():
+            cache = self._graph_data_cache
+            if cache is None or cache[0] != self._generation:
+                cache = self._graph_data_cache = (
+                    self._generation,
+                    list(self.graph.nodes(data=True)),
+                    list(self.graph.edges(data=True, keys=True)),
+                )
+
+            # Copies, so callers can't modify the cached lists
+            return list(cache[1]), list(cache[2])
+
+    async def _reload_if_changed(self) -> None:
+        if self.graph is None or self._graph_files_changed():
+            self.graph_data_cache_misses += 1
+            await self.load_graph_from_file()
+        else:
+            self.graph_data_cache_hits += 1
+
+    def _iterate_graph_items(self, section: str) -> Iterator:
+        if section == "nodes":
+            return iter(self.graph._node.items())
+        return (
+            (source, target, key, data)
+            for source, neighbors in self.graph._succ.items()
+            for target, edges in neighbors.items()
+            for key, data in edges.items()
+        )
+
+    async def _stream_pages(
+        self, sections: Tuple[str, ...], page_size: int, cursor: Optional[str]
+    ) -> AsyncIterator[Tuple[str, list, str]]:
+        """
+        Yield the nodes and/or edges of the graph in pages, holding the shared lock only
+        while a page is collected.
+
+        A cursor is the section and the offset of the next item in it. The same iterator is
+        continued while the graph is unchanged, after a mutation the section is iterated again
+        from the cursor offset, so items may be skipped or repeated if the graph changed
+        between two pages.
+        """
+        if page_size < 1:
+            raise ValueError("page_size must be at least 1")
+
+        section, offset = sections[0], 0
+        if cursor is not None:
+            section, _, offset = cursor.partition(":")
+            if section not in sections or not offset.isdigit():
+                raise ValueError(f"Invalid graph data cursor: {cursor!r}")
+            offset = int(offset)
+
+        for section in sections[sections.index(section) :]:
+            items, generation = None, None
+
+            while True:
+                # The graph may have been unloaded between two pages
+                await self._ensure_graph_loaded()
+
+                async with self._graph_lock.read():
+                    if items is None or generation != self._generation:
+                        items = islice(self._iterate_graph_items(section), offset, None)
+                        generation = self._generation
+                    page = list(islice(items, page_size))
+
+                if not page:
+                    break
+
+                offset += len(page)
+                yield section, page, f"{section}:{offset}"
+
+                if len(page) < page_size:
+                    break
+
+            offset = 0
+
+    async def stream_graph_data(
+        self, page_size: int = 1000, cursor: Optional[str] = None
+    ) -> AsyncIterator[Tuple[str, list, str]]:
+        """
+        Stream the nodes and then the edges of the graph in pages, so they can be exported
+        without materializing the complete lists `get_graph_data` returns.
+
+        Parameters:
+        -----------
+
+            - page_size (int): The maximum number of nodes or edges per page. (default 1000)
+            - cursor (Optional[str]): A cursor returned with an earlier page, to resume the
+              stream after that page. (default None)
+
+        Returns:
+        --------
+
+            - AsyncIterator[Tuple[str, list, str]]: Tuples of the section ('nodes'
+              or 'edges'), a page of (node_id, data) or (source, target, key, data) tuples
+              like `get_graph_data` returns them, and the cursor to resume after the page.
+        """
+        await self._reload_if_changed()
 
-    async def query(self, query: str, params: dict):
+        async for page in self._stream_pages(("nodes", "edges"), page_size, cursor):
+            yield page
+
+    @_reads_graph
+    async def query(self, query: str, params: dict = None) -> List[Dict[str, Any]]:
         """
-        Execute a query against the graph data. The specifics of the query execution need to be
-        implemented.
+        Execute a Cypher-like pattern query against the graph data.
+
+        Supported are MATCH patterns of nodes with a label (their `type`) and inline
+        properties connected by up to two relationships (matched by relationship name), WHERE
+        conditions on node and relationship properties joined with AND, RETURN of variables
+        or their properties and LIMIT. Parsed queries are cached by query string.
 
         Parameters:
         -----------
 
             - query (str): The query string to run against the graph.
-            - params (dict): Parameters for the query, if necessary.
+            - params (dict): Values of the $parameters used in the query. (default None)
+
+        Returns:
+        --------
+
+            - List[Dict[str, Any]]: One record per match, keyed by the returned columns.
         """
-        pass
+        plan = compile_query(query)
+        return plan.execute(self.graph, self._get_attribute_index(), params)
 
     async def has_node(self, node_id: UUID) -> bool:
         """
@@ -89,6 +1016,7 @@ class NetworkXAdapter(GraphDBInterface):
 
             - bool: True if the node exists, otherwise False.
         """
+        await self._ensure_graph_loaded()
         return self.graph.has_node(node_id)
 
     async def add_node(self, node: DataPoint) -> None:
@@ -100,9 +1028,7 @@ class NetworkXAdapter(GraphDBInterface):
 
             - node (DataPoint): The node to be added, represented as a DataPoint object.
         """
-        self.graph.add_node(node.id, **node.model_dump())
-
-        await self.save_graph_to_file(self.filename)
+        await self._commit_mutation("add_nodes", [(node.id, node.model_dump())])
 
     @record_graph_changes
     async def add_nodes(self, nodes: list[DataPoint]) -> None:
@@ -116,8 +1042,7 @@ class NetworkXAdapter(GraphDBInterface):
               added.
         """
         nodes = [(node.id, node.model_dump()) for node in nodes]
-        self.graph.add_nodes_from(nodes)
-        await self.save_graph_to_file(self.filename)
+        await self._commit_mutation("add_nodes", nodes)
 
     async def get_graph(self):
         """
@@ -128,6 +1053,7 @@ class NetworkXAdapter(GraphDBInterface):
 
             The current graph instance.
         """
+        await self._ensure_graph_loaded()
         return self.graph
 
     async def has_edge(self, from_node: str, to_node: str, edge_label: str) -> bool:
@@ -146,8 +1072,10 @@ class NetworkXAdapter(GraphDBInterface):
 
             - bool: True if the edge exists, otherwise False.
         """
+        await self._ensure_graph_loaded()
         return self.graph.has_edge(from_node, to_node, key=edge_label)
 
+    @_reads_graph
     async def has_edges(self, edges):
         """
         Check for the existence of multiple edges in the graph.
@@ -161,15 +1089,31 @@ class NetworkXAdapter(GraphDBInterface):
         Returns:
         --------
 
-            A list of edges that exist in the graph.
+            A list of edges that exist in the graph, in the order they were given.
         """
-        result = []
+        successors = self.graph._succ
+        edges = list(edges)
 
-        for from_node, to_node, edge_label in edges:
-            if self.graph.has_edge(from_node, to_node, edge_label):
-                result.append((from_node, to_node, edge_label))
+        # Group the candidate edges by their source node, so the adjacency of a source is
+        # looked up once for all of its edges instead of once per edge.
+        edges_by_source = {}
+        for index, edge in enumerate(edges):
+            edges_by_source.setdefault(edge[0], []).append(index)
 
-        return result
+        found = []
+        for from_node, indices in edges_by_source.items():
+            neighbors = successors.get(from_node)
+            if neighbors is None:
+                continue
+
+            for index in indices:
+                _, to_node, edge_label = edges[index]
+                keys = neighbors.get(to_node)
+                if keys is not None and edge_label in keys:
+                    found.append(index)
+
+        found.sort()
+        return [tuple(edges[index]) for index in found]
 
     @record_graph_changes
     async def add_edge(
@@ -192,15 +1136,11 @@ class NetworkXAdapter(GraphDBInterface):
               (default {})
         """
         edge_properties["updated_at"] = datetime.now(timezone.utc)
-        self.graph.add_edge(
-            from_node,
-            to_node,
-            key=relationship_name,
-            **(edge_properties if edge_properties else {}),
+        await self._commit_mutation(
+            "add_edges",
+            _edges_with_node_keys([(from_node, to_node, relationship_name, edge_properties)]),
         )
 
-        await self.save_graph_to_file(self.filename)
-
     @record_graph_changes
     async def add_edges(self, edges: list[tuple[str, str, str, dict]]) -> None:
         """
@@ -217,46 +1157,84 @@ class NetworkXAdapter(GraphDBInterface):
             return
 
         try:
-            # Validate edge format and convert UUIDs to strings
+            # One timestamp for the whole batch, the edges are added in the same mutation
+            updated_at = datetime.now(timezone.utc)
+
+            # Validate edge format and key the endpoints like the nodes
             processed_edges = []
+            parsed_ids = {}
             for edge in edges:
-                if len(edge) < 3 or len(edge) > 4:
+                if len(edge) == 4:
+                    from_node, to_node, relationship_name, properties = edge
+                elif len(edge) == 3:
+                    from_node, to_node, relationship_name = edge
+                    properties = None
+                else:
                     raise ValueError(
                         f"Invalid edge format: {edge}. Expected (from_node, to_node, relationship_name[, properties])"
                     )
 
-                # Convert UUIDs to strings if needed
-                from_node = str(edge[0]) if isinstance(edge[0], UUID) else edge[0]
-                to_node = str(edge[1]) if isinstance(edge[1], UUID) else edge[1]
-                relationship_name = edge[2]
-
-                if not all(isinstance(x, str) for x in [from_node, to_node, relationship_name]):
+                # Exact type checks first, they cover almost all node ids
+                if type(from_node) is not UUID:
+                    from_node = _edge_node_id(from_node, edge, parsed_ids)
+                if type(to_node) is not UUID:
+                    to_node = _edge_node_id(to_node, edge, parsed_ids)
+                if not isinstance(relationship_name, str):
                     raise ValueError(
                         f"First three elements of edge must be strings or UUIDs: {edge}"
                     )
 
-                # Process edge with updated_at timestamp
-                processed_edge = (
-                    from_node,
-                    to_node,
-                    relationship_name,
-                    {
-                        **(edge[3] if len(edge) == 4 else {}),
-                        "updated_at": datetime.now(timezone.utc),
-                    },
+                processed_edges.append(
+                    (
+                        from_node,
+                        to_node,
+                        relationship_name,
+                        {**properties, "updated_at": updated_at}
+                        if properties
+                        else {"updated_at": updated_at},
+                    )
                 )
-                processed_edges.append(processed_edge)
 
-            # Add edges to graph
-            self.graph.add_edges_from(processed_edges)
+            # Add edges to graph and log the change
+            await self._commit_mutation("add_edges", processed_edges)
             logger.debug(f"Added {len(processed_edges)} edges to graph")
-
-            # Save changes
-            await self.save_graph_to_file(self.filename)
         except Exception as e:
             logger.error(f"Failed to add edges: {e}")
             raise
 
+    async def add_edges_from_columns(
+        self,
+        from_nodes: Sequence,
+        to_nodes: Sequence,
+        relationship_names: Sequence,
+        edge_properties: Optional[Sequence[dict]] = None,
+    ) -> None:
+        """
+        Bulk add edges given as parallel sequences instead of edge tuples, e.g. columns of a
+        data frame or arrays.
+
+        The columns are zipped into edges and added with `add_edges`, so the edges are
+        validated and recorded the same way.
+
+        Parameters:
+        -----------
+
+            - from_nodes (Sequence): The identifiers of the source nodes.
+            - to_nodes (Sequence): The identifiers of the target nodes.
+            - relationship_names (Sequence): The labels of the relationships.
+            - edge_properties (Optional[Sequence[dict]]): The properties of each edge, if any.
+              (default None)
+        """
+        columns = [from_nodes, to_nodes, relationship_names]
+        if edge_properties is not None:
+            columns.append(edge_properties)
+
+        if len({len(column) for column in columns}) > 1:
+            raise ValueError("All edge columns must have the same length")
+
+        await self.add_edges(list(zip(*columns)))
+
+    @_reads_graph
     async def get_edges(self, node_id: UUID):
         """
         Retrieve edges connected to a specific node.
@@ -284,18 +1262,11 @@ class NetworkXAdapter(GraphDBInterface):
 
             - node_id (UUID): The identifier of the node to delete.
         """
+        await self._ensure_graph_loaded()
 
         if self.graph.has_node(node_id):
-            # First remove all edges connected to the node
-            for edge in list(self.graph.edges(node_id, data=True)):
-                source, target, data = edge
-                self.graph.remove_edge(source, target, key=data.get("relationship_name"))
-
-            # Then remove the node itself
-            self.graph.remove_node(node_id)
-
-            # Save the updated graph state
-            await self.save_graph_to_file(self.filename)
+            # Removing the node also removes all edges connected to it
+            await self._commit_mutation("remove_nodes", [node_id])
         else:
             logger.error(f"Node {node_id} not found in graph")
 
@@ -308,9 +1279,17 @@ class NetworkXAdapter(GraphDBInterface):
 
             - node_ids (List[UUID]): A list of node identifiers to delete.
         """
-        self.graph.remove_nodes_from(node_ids)
-        await self.save_graph_to_file(self.filename)
+        await self._ensure_graph_loaded()
+
+        # Removing the nodes also removes all edges connected to them, so the whole deletion
+        # is a single mutation holding only the identifiers of the nodes.
+        nodes = self.graph._node
+        node_ids = [node_id for node_id in dict.fromkeys(node_ids) if node_id in nodes]
+
+        if node_ids:
+            await self._commit_mutation("remove_nodes", node_ids)
 
+    @_reads_graph
     async def get_disconnected_nodes(self) -> List[str]:
         """
         Identify nodes that are not connected to any other nodes in the graph.
@@ -320,16 +1299,9 @@ class NetworkXAdapter(GraphDBInterface):
 
             - List[str]: A list of identifiers for disconnected nodes.
         """
-        connected_components = list(nx.weakly_connected_components(self.graph))
-
-        disconnected_nodes = []
-        biggest_subgraph = max(connected_components, key=len)
-
-        for component in connected_components:
-            if component != biggest_subgraph:
-                disconnected_nodes.extend(list(component))
-
-        return disconnected_nodes
+        # The weakly connected components are maintained while nodes and edges are added
+        components = await self._get_component_index()
+        return components.nodes_outside_largest()
 
     async def extract_node(self, node_id: UUID) -> dict:
         """
@@ -345,11 +1317,13 @@ class NetworkXAdapter(GraphDBInterface):
 
             - dict: The data of the specified node, or None if not found.
         """
+        await self._ensure_graph_loaded()
         if self.graph.has_node(node_id):
             return self.graph.nodes[node_id]
 
         return None
 
+    @_reads_graph
     async def extract_nodes(self, node_ids: List[UUID]) -> List[dict]:
         """
         Retrieve data for multiple nodes based on their identifiers.
@@ -366,6 +1340,7 @@ class NetworkXAdapter(GraphDBInterface):
         """
         return [self.graph.nodes[node_id] for node_id in node_ids if self.graph.has_node(node_id)]
 
+    @_reads_graph
     async def get_predecessors(self, node_id: UUID, edge_label: str = None) -> list:
         """
         Retrieve the predecessor nodes of a specified node according to a specific edge label.
@@ -397,6 +1372,7 @@ class NetworkXAdapter(GraphDBInterface):
 
             return nodes
 
+    @_reads_graph
     async def get_successors(self, node_id: UUID, edge_label: str = None) -> list:
         """
         Retrieve the successor nodes of a specified node according to a specific edge label.
@@ -428,6 +1404,7 @@ class NetworkXAdapter(GraphDBInterface):
 
             return nodes
 
+    @_reads_graph
     async def get_neighbors(self, node_id: UUID) -> list:
         """
         Get the neighboring nodes of a specified node, including both predecessors and
@@ -455,6 +1432,7 @@ class NetworkXAdapter(GraphDBInterface):
 
         return neighbors
 
+    @_reads_graph
     async def get_connections(self, node_id: UUID) -> list:
         """
         Get the connections of a specified node to its neighbors.
@@ -503,6 +1481,168 @@ class NetworkXAdapter(GraphDBInterface):
 
         return connections
 
+    def _neighbors_of_nodes(self, node_ids: List[UUID], adjacency, edge_label: str = None) -> dict:
+        # Works on the adjacency dictionaries of the graph, the networkx views around them add
+        # a noticeable overhead to every neighbor lookup
+        nodes = self.graph._node
+        neighbors = {}
+
+        for node_id in node_ids:
+            if node_id in neighbors:
+                continue
+            if node_id not in adjacency:
+                neighbors[node_id] = []
+            elif edge_label is None:
+                neighbors[node_id] = [nodes[neighbor_id] for neighbor_id in adjacency[node_id]]
+            else:
+                neighbors[node_id] = [
+                    nodes[neighbor_id]
+                    for neighbor_id, edges in adjacency[node_id].items()
+                    if edge_label in edges
+                ]
+
+        return neighbors
+
+    @_reads_graph
+    async def batch_get_predecessors(
+        self, node_ids: List[UUID], edge_label: str = None
+    ) -> Dict[UUID, list]:
+        """
+        Retrieve the predecessor nodes of several nodes at once.
+
+        Parameters:
+        -----------
+
+            - node_ids (List[UUID]): The identifiers of the nodes for which to find
+              predecessors.
+            - edge_label (str): The label for the edges connecting to predecessors; if None, all
+              predecessors are retrieved. (default None)
+
+        Returns:
+        --------
+
+            - Dict[UUID, list]: The predecessor nodes of each requested node, an empty list for
+              nodes that are not in the graph.
+        """
+        return self._neighbors_of_nodes(node_ids, self.graph._pred, edge_label)
+
+    @_reads_graph
+    async def batch_get_successors(
+        self, node_ids: List[UUID], edge_label: str = None
+    ) -> Dict[UUID, list]:
+        """
+        Retrieve the successor nodes of several nodes at once.
+
+        Parameters:
+        -----------
+
+            - node_ids (List[UUID]): The identifiers of the nodes for which to find successors.
+            - edge_label (str): The label for the edges connecting to successors; if None, all
+              successors are retrieved. (default None)
+
+        Returns:
+        --------
+
+            - Dict[UUID, list]: The successor nodes of each requested node, an empty list for
+              nodes that are not in the graph.
+        """
+        return self._neighbors_of_nodes(node_ids, self.graph._succ, edge_label)
+
+    @_reads_graph
+    async def batch_get_neighbors(self, node_ids: List[UUID]) -> Dict[UUID, list]:
+        """
+        Get the neighboring nodes of several nodes at once, including both predecessors and
+        successors.
+
+        Parameters:
+        -----------
+
+            - node_ids (List[UUID]): The identifiers of the nodes whose neighbors are to be
+              retrieved.
+
+        Returns:
+        --------
+
+            - Dict[UUID, list]: The neighbors of each requested node, like `get_neighbors`
+              returns them. Neighbors shared between nodes are the same node dictionaries.
+        """
+        predecessors = self._neighbors_of_nodes(node_ids, self.graph._pred)
+        successors = self._neighbors_of_nodes(node_ids, self.graph._succ)
+
+        return {
+            node_id: node_predecessors + successors[node_id]
+            for node_id, node_predecessors in predecessors.items()
+        }
+
+    @_reads_graph
+    async def batch_get_connections(self, node_ids: List[UUID]) -> list:
+        """
+        Get the connections of several nodes to their neighbors in a single pass.
+
+        Parameters:
+        -----------
+
+            - node_ids (List[UUID]): The identifiers of the nodes for which to get connections.
+
+        Returns:
+        --------
+
+            - list: The connections involving any of the specified nodes, as (source node,
+              edge properties, target node) tuples like `get_connections` returns them. Every
+              edge is listed once, also when both of its endpoints were requested.
+        """
+        nodes = self.graph._node
+        requested_nodes = {}
+
+        for node_id in node_ids:
+            node = nodes.get(node_id)
+            if node is not None and "id" in node:
+                requested_nodes[node_id] = node
+
+        predecessors = self.graph._pred
+        successors = self.graph._succ
+        connections = []
+
+        for node_id, node in requested_nodes.items():
+            for neighbor_id, edges in predecessors[node_id].items():
+                # Edges between requested nodes are listed with the outgoing edges of their source
+                if neighbor_id in requested_nodes:
+                    continue
+                neighbor = nodes[neighbor_id]
+                if "id" in neighbor:
+                    for edge_properties in edges.values():
+                        connections.append((neighbor, edge_properties, node))
+
+            for neighbor_id, edges in successors[node_id].items():
+                neighbor = nodes[neighbor_id]
+                if "id" in neighbor:
+                    for edge_properties in edges.values():
+                        connections.append((node, edge_properties, neighbor))
+
+        return connections
+
+    def _edges_with_label(self, node_ids: List[UUID], edge_label: str, incoming: bool) -> list:
+        """
+        Collect the edges with a label that end at (incoming) or start from the given nodes as
+        (source, target, key) triples, each edge once, in a single pass over their adjacency.
+        """
+        adjacency = self.graph._pred if incoming else self.graph._succ
+        edges = []
+
+        for node_id in dict.fromkeys(node_ids):
+            neighbors = adjacency.get(node_id)
+            if neighbors is None:
+                continue
+            for neighbor_id, keys in neighbors.items():
+                if edge_label in keys:
+                    edges.append(
+                        (neighbor_id, node_id, edge_label)
+                        if incoming
+                        else (node_id, neighbor_id, edge_label)
+                    )
+
+        return edges
+
     async def remove_connection_to_predecessors_of(
         self, node_ids: list[UUID], edge_label: str
     ) -> None:
@@ -517,13 +1657,11 @@ class NetworkXAdapter(GraphDBInterface):
               need to be removed.
             - edge_label (str): The label of the edges to remove.
         """
-        for node_id in node_ids:
-            if self.graph.has_node(node_id):
-                for predecessor_id in list(self.graph.predecessors(node_id)):
-                    if self.graph.has_edge(predecessor_id, node_id, edge_label):
-                        self.graph.remove_edge(predecessor_id, node_id, edge_label)
+        await self._ensure_graph_loaded()
 
-        await self.save_graph_to_file(self.filename)
+        edges = self._edges_with_label(node_ids, edge_label, incoming=True)
+        if edges:
+            await self._commit_mutation("remove_edges", edges)
 
     async def remove_connection_to_successors_of(
         self, node_ids: list[UUID], edge_label: str
@@ -539,14 +1677,13 @@ class NetworkXAdapter(GraphDBInterface):
               to be removed.
             - edge_label (str): The label of the edges to remove.
         """
-        for node_id in node_ids:
-            if self.graph.has_node(node_id):
-                for successor_id in list(self.graph.successors(node_id)):
-                    if self.graph.has_edge(node_id, successor_id, edge_label):
-                        self.graph.remove_edge(node_id, successor_id, edge_label)
+        await self._ensure_graph_loaded()
 
-        await self.save_graph_to_file(self.filename)
+        edges = self._edges_with_label(node_ids, edge_label, incoming=False)
+        if edges:
+            await self._commit_mutation("remove_edges", edges)
 
+    @_writes_graph
     async def create_empty_graph(self, file_path: str) -> None:
         """
         Initialize an empty graph and save it to a specified file path.
@@ -557,36 +1694,104 @@ class NetworkXAdapter(GraphDBInterface):
             - file_path (str): The file path where the empty graph should be saved.
         """
         self.graph = nx.MultiDiGraph()
+        self._generation += 1
 
         # Only create directory if file_path contains a directory
         file_dir = os.path.dirname(file_path)
         if file_dir and not os.path.exists(file_dir):
             os.makedirs(file_dir, exist_ok=True)
 
-        await self.save_graph_to_file(file_path)
+        if file_path == self.filename:
+            with self._writing_graph_files():
+                snapshot_sequence = await self.save_graph_to_file(file_path)
+                await self._mutation_log.truncate(snapshot_sequence)
+        else:
+            await self.save_graph_to_file(file_path)
+            # The in-memory graph no longer matches the default graph files
+            self._disk_stamp = None
+
+    async def migrate_graph_file(self, snapshot_format: str = "binary") -> None:
+        """
+        Rewrite the graph file in the given snapshot format and use that format from now on.
+
+        Parameters:
+        -----------
+
+            - snapshot_format (str): Either 'json' or 'binary'. (default 'binary')
+        """
+        if snapshot_format not in ("json", "binary"):
+            raise ValueError("snapshot_format must be either 'json' or 'binary'")
+
+        if self.graph is None:
+            await self.load_graph_from_file()
+
+        self.snapshot_format = snapshot_format
+        with self._writing_graph_files():
+            snapshot_sequence = await self.save_graph_to_file(self.filename)
+            await self._mutation_log.truncate(snapshot_sequence)
 
     async def save_graph_to_file(self, file_path: str = None) -> None:
         """
-        Save the graph data asynchronously to a specified file in JSON format.
+        Save the graph data asynchronously to a specified file, either in JSON format or in
+        the columnar binary format depending on `snapshot_format`.
+
+        The snapshot records the sequence number of the last logged mutation it contains, so
+        that only newer mutation log entries are replayed when it is loaded.
 
         Parameters:
         -----------
 
             - file_path (str): The file path to save the graph data; if None, saves to the
               default filename. (default None)
+
+        Returns:
+        --------
+
+            - int: The mutation log sequence number stored in the snapshot.
         """
         if not file_path:
             file_path = self.filename
 
-        graph_data = nx.readwrite.json_graph.node_link_data(self.graph, edges="links")
+        # Only copying the graph happens under the shared lock, so the copy is consistent with
+        # the sequence number it records. A writer queued behind the lock would otherwise
+        # hold up every new reader for the whole serialization. The copy is serialized and
+        # written to disk after the lock is released, off the event loop.
+        async with self._graph_lock.read():
+            await self._snapshot_lock.acquire()
+            try:
+                snapshot_sequence = self._mutation_log.sequence
+                graph = await asyncio.to_thread(copy_graph, self.graph)
+            except BaseException:
+                self._snapshot_lock.release()
+                raise
 
-        async with aiofiles.open(file_path, "w") as file:
-            json_data = json.dumps(graph_data, cls=JSONEncoder)
-            await file.write(json_data)
+        try:
+            try:
+                snapshot = await self._run_in_executor(
+                    serialize_graph, graph, self.snapshot_format, snapshot_sequence
+                )
+            finally:
+                # Freeing millions of dictionaries takes a while, so not on the event loop
+                await asyncio.to_thread(graph.clear)
+
+            if file_path == self.filename:
+                with self._writing_graph_files():
+                    await self._run_in_executor(write_file_atomically, file_path, snapshot)
+            else:
+                await self._run_in_executor(write_file_atomically, file_path, snapshot)
+        finally:
+            self._snapshot_lock.release()
+
+        return snapshot_sequence
 
     async def load_graph_from_file(self, file_path: str = None):
         """
-        Load graph data asynchronously from a specified file in JSON format.
+        Load graph data asynchronously from a specified file and replay the mutation log
+        entries written after the snapshot. Both JSON and binary snapshots are supported and
+        detected automatically.
+
+        The snapshot is decoded in the serialization executor while the current graph keeps
+        serving queries, and is swapped in under the exclusive lock.
 
         Parameters:
         -----------
@@ -598,64 +1803,44 @@ class NetworkXAdapter(GraphDBInterface):
             file_path = self.filename
         try:
             if os.path.exists(file_path):
-                async with aiofiles.open(file_path, "r") as file:
-                    graph_data = json.loads(await file.read())
-                    for node in graph_data["nodes"]:
-                        try:
-                            if not isinstance(node["id"], UUID):
-                                try:
-                                    node["id"] = UUID(node["id"])
-                                except Exception:
-                                    # If conversion fails, keep the original id
-                                    pass
-                        except Exception as e:
-                            logger.error(e)
-                            raise e
-
-                        if isinstance(node.get("updated_at"), int):
-                            node["updated_at"] = datetime.fromtimestamp(
-                                node["updated_at"] / 1000, tz=timezone.utc
-                            )
-                        elif isinstance(node.get("updated_at"), str):
-                            node["updated_at"] = datetime.strptime(
-                                node["updated_at"], "%Y-%m-%dT%H:%M:%S.%f%z"
-                            )
-
-                    for edge in graph_data["links"]:
-                        try:
-                            if not isinstance(edge["source"], UUID):
-                                source_id = parse_id(edge["source"])
-                            else:
-                                source_id = edge["source"]
-
-                            if not isinstance(edge["target"], UUID):
-                                target_id = parse_id(edge["target"])
-                            else:
-                                target_id = edge["target"]
-
-                            edge["source"] = source_id
-                            edge["target"] = target_id
-                            edge["source_node_id"] = source_id
-                            edge["target_node_id"] = target_id
-                        except Exception as e:
-                            logger.error(e)
-                            raise e
-
-                        if isinstance(
-                            edge.get("updated_at"), int
-                        ):  # Handle timestamp in milliseconds
-                            edge["updated_at"] = datetime.fromtimestamp(
-                                edge["updated_at"] / 1000, tz=timezone.utc
-                            )
-                        elif isinstance(edge.get("updated_at"), str):
-                            edge["updated_at"] = datetime.strptime(
-                                edge["updated_at"], "%Y-%m-%dT%H:%M:%S.%f%z"
+                graph, snapshot_sequence, file_stamp = await self._run_in_executor(
+                    read_graph_file, file_path, self.compact_storage
+                )
+                attribute_index = await self._index_graph(graph)
+
+                async with self._graph_lock.write():
+                    async with self._snapshot_lock:
+                        # A snapshot written while the file was being decoded may already
+                        # have dropped log entries the decoded snapshot doesn't contain.
+                        if file_stamp != get_file_stamp(file_path):
+                            graph, snapshot_sequence, file_stamp = await self._run_in_executor(
+                                read_graph_file, file_path, self.compact_storage
                             )
-
-                    self.graph = nx.readwrite.json_graph.node_link_graph(graph_data, edges="links")
-
-                    for node_id, node_data in self.graph.nodes(data=True):
-                        node_data["id"] = node_id
+                            attribute_index = await self._index_graph(graph)
+
+                        # Replay the mutations logged after the snapshot was written
+                        if file_path == self.filename:
+                            mutation_log = self._mutation_log
+                            await mutation_log.flush()
+                            # Taken before the log is read, a later write shows up as a change
+                            self._disk_stamp = (file_stamp, get_file_stamp(mutation_log.file_path))
+                        else:
+                            mutation_log = MutationLog(f"{file_path}.wal")
+                            self._disk_stamp = None
+
+                        self.graph = graph
+                        self._attribute_index = attribute_index
+                        self._generation += 1
+
+                        for operation, items in mutation_log.replay(snapshot_sequence):
+                            items = _deserialize_logged_items(operation, items)
+                            self._apply_mutation(operation, items)
+
+                            if operation == "add_edges":
+                                # Endpoints that were added implicitly by an edge
+                                for source, target, _, _ in items:
+                                    self.graph.nodes[source].setdefault("id", source)
+                                    self.graph.nodes[target].setdefault("id", target)
             else:
                 # Log that the file does not exist and an empty graph is initialized
                 logger.warning("File %s not found. Initializing an empty graph.", file_path)
@@ -666,6 +1851,9 @@ class NetworkXAdapter(GraphDBInterface):
 
             await self.create_empty_graph(file_path)
 
+        self._unload_idle_graphs()
+
+    @_writes_graph
     async def delete_graph(self, file_path: str = None):
         """
         Delete the graph file from the filesystem asynchronously.
@@ -684,27 +1872,70 @@ class NetworkXAdapter(GraphDBInterface):
             if os.path.exists(file_path):
                 await aiofiles_os.remove(file_path)
 
+            if file_path == self.filename:
+                await self._mutation_log.delete()
+            elif os.path.exists(f"{file_path}.wal"):
+                await aiofiles_os.remove(f"{file_path}.wal")
+
             self.graph = None
+            self._generation += 1
+            self._disk_stamp = None
             logger.info("Graph deleted successfully.")
         except Exception as error:
             logger.error("Failed to delete graph: %s", error)
             raise error
 
+    @_reads_graph
     async def get_nodeset_subgraph(
         self, node_type: Type[Any], node_name: List[str]
     ) -> Tuple[List[Tuple[int, dict]], List[Tuple[int, int, str, dict]]]:
         """
-        Obtain a subgraph based on specific node types and names. Not supported in this
-        implementation.
+        Obtain the subgraph made of the nodes with the given type and names together with
+        their direct neighbors, and the edges between all of these nodes.
+
+        The named nodes are looked up in the attribute index and expanded one hop over the
+        adjacency of the graph, so the cost depends on the size of the subgraph only.
 
         Parameters:
         -----------
 
             - node_type (Type[Any]): The type of nodes to include in the subgraph.
             - node_name (List[str]): A list of node names to filter by.
+
+        Returns:
+        --------
+
+            - Tuple[List[Tuple[int, dict]], List[Tuple[int, int, str, dict]]]: The nodes as
+              (node_id, properties) tuples and the edges as (source_id, target_id,
+              relationship_name, properties) tuples.
         """
-        raise NodesetFilterNotSupportedError
+        primary_ids = self._find_nodes([("type", [node_type.__name__]), ("name", node_name)])
+        if not primary_ids:
+            return [], []
+
+        successors = self.graph.succ
+        predecessors = self.graph.pred
 
+        # Insertion-ordered, so the named nodes come first followed by their neighbors
+        subgraph_ids = dict.fromkeys(primary_ids)
+        for node_id in primary_ids:
+            subgraph_ids.update(dict.fromkeys(successors[node_id]))
+            subgraph_ids.update(dict.fromkeys(predecessors[node_id]))
+
+        nodes = self.graph.nodes
+        nodes_data = [(node_id, nodes[node_id]) for node_id in subgraph_ids]
+
+        edges_data = [
+            (source, target, relationship_name, data)
+            for source in subgraph_ids
+            for target, edges in successors[source].items()
+            if target in subgraph_ids
+            for relationship_name, data in edges.items()
+        ]
+
+        return nodes_data, edges_data
+
+    @_reads_graph
     async def get_filtered_graph_data(
         self, attribute_filters: List[Dict[str, List[Union[str, int]]]]
     ):
@@ -728,92 +1959,88 @@ class NetworkXAdapter(GraphDBInterface):
             where_clauses.append((attribute, values))
 
         # Filter nodes
-        filtered_nodes = [
-            (node, data)
-            for node, data in self.graph.nodes(data=True)
-            if all(data.get(attr) in values for attr, values in where_clauses)
-        ]
+        nodes = self.graph.nodes
+        filtered_nodes = [(node, nodes[node]) for node in self._find_nodes(where_clauses)]
+        filtered_node_ids = {node for node, _ in filtered_nodes}
 
-        # Filter edges where both source and target nodes satisfy the filters
+        # Filter edges where both source and target nodes satisfy the filters, these are the
+        # outgoing edges of filtered nodes that point to another filtered node
+        successors = self.graph.succ
         filtered_edges = [
             (source, target, data.get("relationship_type", "UNKNOWN"), data)
-            for source, target, data in self.graph.edges(data=True)
-            if (
-                all(self.graph.nodes[source].get(attr) in values for attr, values in where_clauses)
-                and all(
-                    self.graph.nodes[target].get(attr) in values for attr, values in where_clauses
-                )
-            )
+            for source, _ in filtered_nodes
+            for target, edges in successors[source].items()
+            if target in filtered_node_ids
+            for data in edges.values()
         ]
 
         return filtered_nodes, filtered_edges
 
-    async def get_graph_metrics(self, include_optional=False):
+    @_reads_graph
+    async def get_graph_metrics(
+        self, include_optional=False, sample_size: int = 1000, path_sample_size: int = 16
+    ):
         """
         Calculate various metrics related to the graph, optionally including optional metrics.
 
+        The graph is converted once into a sparse adjacency matrix and all metrics are
+        computed from it in a worker thread. Path lengths and clustering are exact on graphs
+        with up to `sample_size` nodes and estimated from sampled nodes otherwise.
+
         Parameters:
         -----------
 
             - include_optional: Indicates whether optional metrics should be included in the
               calculation. (default False)
+            - sample_size (int): The number of nodes sampled for the clustering on larger
+              graphs. (default 1000)
+            - path_sample_size (int): The number of nodes the shortest paths are computed
+              from for the diameter and average shortest path length on larger graphs, each
+              of them costs a BFS over the whole graph. (default 16)
 
         Returns:
         --------
 
             A dictionary containing the calculated graph metrics.
         """
-        graph = self.graph
-
-        def _get_mean_degree(graph):
-            degrees = [d for _, d in graph.degree()]
-            return np.mean(degrees) if degrees else 0
-
-        def _get_edge_density(graph):
-            num_nodes = graph.number_of_nodes()
-            num_edges = graph.number_of_edges()
-            num_possible_edges = num_nodes * (num_nodes - 1)
-            edge_density = num_edges / num_possible_edges if num_possible_edges > 0 else 0
-            return edge_density
-
-        def _get_diameter(graph):
-            try:
-                return nx.diameter(nx.DiGraph(graph.to_undirected()))
-            except Exception as e:
-                logger.warning("Failed to calculate diameter: %s", e)
-                return None
+        components = await self._get_component_index()
 
-        def _get_avg_shortest_path_length(graph):
-            try:
-                return nx.average_shortest_path_length(nx.DiGraph(graph.to_undirected()))
-            except Exception as e:
-                logger.warning("Failed to calculate average shortest path length: %s", e)
-                return None
+        return await asyncio.to_thread(
+            self._compute_graph_metrics,
+            self.graph,
+            include_optional,
+            sample_size,
+            path_sample_size,
+            components.count(),
+            components.sizes(),
+        )
 
-        def _get_avg_clustering(graph):
-            try:
-                return nx.average_clustering(nx.DiGraph(graph.to_undirected()))
-            except Exception as e:
-                logger.warning("Failed to calculate clustering coefficient: %s", e)
-                return None
+    @staticmethod
+    def _compute_graph_metrics(
+        graph,
+        include_optional: bool,
+        sample_size: int,
+        path_sample_size: int,
+        num_connected_components: int,
+        sizes_of_connected_components: list,
+    ) -> dict:
+        metrics = GraphMetrics(graph, sample_size=sample_size, path_sample_size=path_sample_size)
 
         mandatory_metrics = {
-            "num_nodes": graph.number_of_nodes(),
-            "num_edges": graph.number_of_edges(),
-            "mean_degree": _get_mean_degree(graph),
-            "edge_density": _get_edge_density(graph),
-            "num_connected_components": nx.number_weakly_connected_components(graph),
-            "sizes_of_connected_components": [
-                len(c) for c in nx.weakly_connected_components(graph)
-            ],
+            "num_nodes": metrics.num_nodes,
+            "num_edges": metrics.num_edges(),
+            "mean_degree": metrics.mean_degree(),
+            "edge_density": metrics.edge_density(),
+            "num_connected_components": num_connected_components,
+            "sizes_of_connected_components": sizes_of_connected_components,
         }
 
         if include_optional:
             optional_metrics = {
-                "num_selfloops": sum(1 for u, v in graph.edges() if u == v),
-                "diameter": _get_diameter(graph),
-                "avg_shortest_path_length": _get_avg_shortest_path_length(graph),
-                "avg_clustering": _get_avg_clustering(graph),
+                "num_selfloops": metrics.num_selfloops(),
+                "diameter": metrics.diameter(),
+                "avg_shortest_path_length": metrics.avg_shortest_path_length(),
+                "avg_clustering": metrics.avg_clustering(),
             }
         else:
             optional_metrics = {
@@ -846,107 +2073,118 @@ class NetworkXAdapter(GraphDBInterface):
         if self.graph is None:
             await self.load_graph_from_file()
 
-        # Find the document node by looking for content_hash in the name field
-        document = None
-        document_node_id = None
-        for node_id, attrs in self.graph.nodes(data=True):
-            if (
-                attrs.get("type") in ["TextDocument", "PdfDocument"]
-                and attrs.get("name") == f"text_{content_hash}"
+        async with self._graph_lock.read():
+            nodes = self.graph.nodes
+            successors = self.graph.succ
+            predecessors = self.graph.pred
+
+            def neighbors_by_relationship(adjacency, node_id, relationship_names):
+                # Yields a neighbor once per matching edge, like iterating over the edges did
+                for neighbor_id, edges in adjacency[node_id].items():
+                    for edge_data in edges.values():
+                        if edge_data.get("relationship_name") in relationship_names:
+                            yield neighbor_id
+
+            # Find the document node by its name, which embeds the content hash, through the
+            # name index
+            document = None
+            document_node_id = None
+            for node_id in self._find_nodes(
+                [("name", [f"text_{content_hash}"]), ("type", ["TextDocument", "PdfDocument"])]
             ):
+                attrs = nodes[node_id]
                 document = {"id": str(node_id), **attrs}  # Convert UUID to string for consistency
                 document_node_id = node_id  # Keep the original UUID
                 break
 
-        if not document:
-            return None
+            if not document:
+                return None
 
-        # Find chunks connected via is_part_of (chunks point TO document)
-        chunks = []
-        for source, target, edge_data in self.graph.in_edges(document_node_id, data=True):
-            if edge_data.get("relationship_name") == "is_part_of":
-                chunks.append({"id": source, **self.graph.nodes[source]})  # Keep as UUID object
-
-        # Find entities connected to chunks (chunks point TO entities via contains)
-        entities = []
-        for chunk in chunks:
-            chunk_id = chunk["id"]  # Already a UUID object
-            for source, target, edge_data in self.graph.out_edges(chunk_id, data=True):
-                if edge_data.get("relationship_name") == "contains":
-                    entities.append(
-                        {"id": target, **self.graph.nodes[target]}
-                    )  # Keep as UUID object
-
-        # Find orphaned entities (entities only connected to chunks we're deleting)
-        orphan_entities = []
-        for entity in entities:
-            entity_id = entity["id"]  # Already a UUID object
-            # Get all chunks that contain this entity
-            containing_chunks = []
-            for source, target, edge_data in self.graph.in_edges(entity_id, data=True):
-                if edge_data.get("relationship_name") == "contains":
-                    containing_chunks.append(source)  # Keep as UUID object
-
-            # Check if all containing chunks are in our chunks list
-            chunk_ids = [chunk["id"] for chunk in chunks]
-            if containing_chunks and all(c in chunk_ids for c in containing_chunks):
-                orphan_entities.append(entity)
-
-        # Find orphaned entity types
-        orphan_types = []
-        seen_types = set()  # Track seen types to avoid duplicates
-        for entity in orphan_entities:
-            entity_id = entity["id"]  # Already a UUID object
-            for _, target, edge_data in self.graph.out_edges(entity_id, data=True):
-                if edge_data.get("relationship_name") in ["is_a", "instance_of"]:
-                    # Check if this type is only connected to entities we're deleting
-                    type_node = self.graph.nodes[target]
-                    if type_node.get("type") == "EntityType" and target not in seen_types:
-                        is_orphaned = True
-                        # Get all incoming edges to this type node
-                        for source, _, edge_data in self.graph.in_edges(target, data=True):
-                            if edge_data.get("relationship_name") in ["is_a", "instance_of"]:
-                                # Check if the source entity is not in our orphan_entities list
-                                if source not in [e["id"] for e in orphan_entities]:
-                                    is_orphaned = False
-                                    break
-                        if is_orphaned:
-                            orphan_types.append({"id": target, **type_node})  # Keep as UUID object
-                            seen_types.add(target)  # Mark as seen
-
-        # Find nodes connected via made_from (chunks point TO summaries)
-        made_from_nodes = []
-        for chunk in chunks:
-            chunk_id = chunk["id"]  # Already a UUID object
-            for source, target, edge_data in self.graph.in_edges(chunk_id, data=True):
-                if edge_data.get("relationship_name") == "made_from":
-                    made_from_nodes.append(
-                        {"id": source, **self.graph.nodes[source]}
-                    )  # Keep as UUID object
-
-        # Return UUIDs directly without string conversion
-        return {
-            "document": [{"id": document["id"], **{k: v for k, v in document.items() if k != "id"}}]
-            if document
-            else [],
-            "chunks": [
-                {"id": chunk["id"], **{k: v for k, v in chunk.items() if k != "id"}}
+            # Find chunks connected via is_part_of (chunks point TO document)
+            chunks = [
+                {"id": source, **nodes[source]}  # Keep as UUID object
+                for source in neighbors_by_relationship(
+                    predecessors, document_node_id, ("is_part_of",)
+                )
+            ]
+            chunk_ids = {chunk["id"] for chunk in chunks}
+
+            # Find entities connected to chunks (chunks point TO entities via contains)
+            entities = [
+                {"id": target, **nodes[target]}  # Keep as UUID object
                 for chunk in chunks
-            ],
-            "orphan_entities": [
-                {"id": entity["id"], **{k: v for k, v in entity.items() if k != "id"}}
-                for entity in orphan_entities
-            ],
-            "made_from_nodes": [
-                {"id": node["id"], **{k: v for k, v in node.items() if k != "id"}}
-                for node in made_from_nodes
-            ],
-            "orphan_types": [
-                {"id": type_node["id"], **{k: v for k, v in type_node.items() if k != "id"}}
-                for type_node in orphan_types
-            ],
-        }
+                for target in neighbors_by_relationship(successors, chunk["id"], ("contains",))
+            ]
+
+            # Find orphaned entities (entities only connected to chunks we're deleting). An
+            # entity contained in several chunks is listed once per chunk, so the check is
+            # only done once per entity.
+            is_orphan = {}
+            for entity in entities:
+                entity_id = entity["id"]
+                if entity_id not in is_orphan:
+                    containing_chunks = set(
+                        neighbors_by_relationship(predecessors, entity_id, ("contains",))
+                    )
+                    is_orphan[entity_id] = (
+                        bool(containing_chunks) and containing_chunks <= chunk_ids
+                    )
 
+            orphan_entities = [entity for entity in entities if is_orphan[entity["id"]]]
+            orphan_entity_ids = {entity["id"] for entity in orphan_entities}
+
+            # Find orphaned entity types, i.e. types only connected to entities we're deleting
+            type_relationships = ("is_a", "instance_of")
+            orphan_types = []
+            seen_types = set()  # Track checked types, so each one is only checked once
+            for entity in orphan_entities:
+                for target in neighbors_by_relationship(
+                    successors, entity["id"], type_relationships
+                ):
+                    type_node = nodes[target]
+                    if type_node.get("type") != "EntityType" or target in seen_types:
+                        continue
+                    seen_types.add(target)
+
+                    if all(
+                        source in orphan_entity_ids
+                        for source in neighbors_by_relationship(
+                            predecessors, target, type_relationships
+                        )
+                    ):
+                        orphan_types.append({"id": target, **type_node})  # Keep as UUID object
+
+            # Find nodes connected via made_from (chunks point TO summaries)
+            made_from_nodes = [
+                {"id": source, **nodes[source]}  # Keep as UUID object
+                for chunk in chunks
+                for source in neighbors_by_relationship(predecessors, chunk["id"], ("made_from",))
+            ]
+
+            # Return UUIDs directly without string conversion
+            return {
+                "document": [{"id": document["id"], **{k: v for k, v in document.items() if k != "id"}}]
+                if document
+                else [],
+                "chunks": [
+                    {"id": chunk["id"], **{k: v for k, v in chunk.items() if k != "id"}}
+                    for chunk in chunks
+                ],
+                "orphan_entities": [
+                    {"id": entity["id"], **{k: v for k, v in entity.items() if k != "id"}}
+                    for entity in orphan_entities
+                ],
+                "made_from_nodes": [
+                    {"id": node["id"], **{k: v for k, v in node.items() if k != "id"}}
+                    for node in made_from_nodes
+                ],
+                "orphan_types": [
+                    {"id": type_node["id"], **{k: v for k, v in type_node.items() if k != "id"}}
+                    for type_node in orphan_types
+                ],
+            }
+
+    @_reads_graph
     async def get_degree_one_nodes(self, node_type: str):
         """
         Retrieve nodes that have only a single connection, filtered by node type.
@@ -965,12 +2203,11 @@ class NetworkXAdapter(GraphDBInterface):
             raise ValueError("node_type must be either 'Entity' or 'EntityType'")
 
         nodes = []
-        for node_id, node_data in self.graph.nodes(data=True):
-            if node_data.get("type") == node_type:
-                # Count both incoming and outgoing edges
-                degree = self.graph.degree(node_id)
-                if degree == 1:
-                    nodes.append(node_data)
+        for node_id in self._find_nodes([("type", [node_type])]):
+            # Count both incoming and outgoing edges
+            degree = self.graph.degree(node_id)
+            if degree == 1:
+                nodes.append(self.graph.nodes[node_id])
         return nodes
 
     async def get_node(self, node_id: UUID) -> dict:
@@ -987,10 +2224,12 @@ class NetworkXAdapter(GraphDBInterface):
 
             - dict: The data of the specified node if found, otherwise None.
         """
+        await self._ensure_graph_loaded()
         if self.graph.has_node(node_id):
             return self.graph.nodes[node_id]
         return None
 
+    @_reads_graph
     async def get_nodes(self, node_ids: List[UUID] = None) -> List[dict]:
         """
         Retrieve data for multiple nodes by their identifiers, or all nodes if no identifiers
@@ -1014,3 +2253,25 @@ class NetworkXAdapter(GraphDBInterface):
             for node_id in node_ids
             if self.graph.has_node(node_id)
         ]
+
+    async def stream_nodes(
+        self, page_size: int = 1000, cursor: Optional[str] = None
+    ) -> AsyncIterator[Tuple[List[dict], str]]:
+        """
+        Stream the data of all nodes in pages, the paginated variant of `get_nodes()`.
+
+        Parameters:
+        -----------
+
+            - page_size (int): The maximum number of nodes per page. (default 1000)
+            - cursor (Optional[str]): A cursor returned with an earlier page, to resume the
+              stream after that page. (default None)
+
+        Returns:
+        --------
+
+            - AsyncIterator[Tuple[List[dict], str]]: Pages of node data like
+              `get_nodes` returns it, each with the cursor to resume after the page.
+        """
+        async for _, page, next_cursor in self._stream_pages(("nodes",), page_size, cursor):
+            yield [{"id": node_id, **data} for node_id, data in page], next_cursor
@@ -0,0 +1,131 @@
+import asyncio
+from collections import deque
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+
+
+class ReadWriteLock:
+    """
+    Asyncio reader/writer lock.
+
+    Any number of readers can hold the lock at the same time, while a writer holds it
+    exclusively. Waiters are served in arrival order, so a waiting writer is not starved by a
+    steady stream of new readers.
+
+    The lock is reentrant per asyncio context: code that already holds the lock (including
+    tasks started from within the locked block) can enter `read` or `write` again without
+    waiting. Upgrading a held read lock to a write lock is not supported.
+    """
+
+    def __init__(self):
+        self._readers = 0
+        self._writer = False
+        self._waiters = deque()
+        self._held = ContextVar(f"read_write_lock_{id(self)}", default=None)
+
+    @property
+    def locked(self) -> bool:
+        """
+        Whether the lock is currently held by a reader or a writer.
+        """
+        return self._writer or self._readers > 0
+
+    @property
+    def in_use(self) -> bool:
+        """
+        Whether the lock is currently held or waited for.
+        """
+        return self.locked or bool(self._waiters)
+
+    def _can_grant(self, exclusive: bool) -> bool:
+        if exclusive:
+            return not self._writer and self._readers == 0
+        return not self._writer
+
+    def _grant(self, exclusive: bool) -> None:
+        if exclusive:
+            self._writer = True
+        else:
+            self._readers += 1
+
+    def _release(self, exclusive: bool) -> None:
+        if exclusive:
+            self._writer = False
+        else:
+            self._readers -= 1
+        self._wake_waiters()
+
+    def _wake_waiters(self) -> None:
+        while self._waiters:
+            exclusive, future = self._waiters[0]
+
+            if future.done():
+                self._waiters.popleft()
+                continue
+
+            if not self._can_grant(exclusive):
+                break
+
+            self._waiters.popleft()
+            self._grant(exclusive)
+            future.set_result(None)
+
+            if exclusive:
+                break
+
+    async def _acquire(self, exclusive: bool) -> None:
+        if not self._waiters and self._can_grant(exclusive):
+            self._grant(exclusive)
+            return
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append((exclusive, future))
+
+        try:
+            await future
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                # The lock was granted right before the waiter got cancelled
+                self._release(exclusive)
+            else:
+                self._wake_waiters()
+            raise
+
+    @asynccontextmanager
+    async def read(self):
+        """
+        Hold the lock shared with other readers for the duration of the block.
+        """
+        if self._held.get() is not None:
+            yield
+            return
+
+        await self._acquire(exclusive=False)
+        token = self._held.set("read")
+        try:
+            yield
+        finally:
+            self._held.reset(token)
+            self._release(exclusive=False)
+
+    @asynccontextmanager
+    async def write(self):
+        """
+        Hold the lock exclusively for the duration of the block.
+        """
+        held = self._held.get()
+
+        if held == "write":
+            yield
+            return
+
+        if held == "read":
+            raise RuntimeError("Cannot acquire the write lock while holding the read lock")
+
+        await self._acquire(exclusive=True)
+        token = self._held.set("write")
+        try:
+            yield
+        finally:
+            self._held.reset(token)
+            self._release(exclusive=True)
@@ -0,0 +1,60 @@
+import sys
+import asyncio
+import inspect
+import pathlib
+
+import pytest
+
+# The adapter is imported through the packages namespace, like in example.py
+sys.path.append(str(pathlib.Path(__file__).parents[4]))
+
+from packages.graph.networkx.networkx_adapter import NetworkXAdapter  # noqa: E402
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_pyfunc_call(pyfuncitem):
+    # Coroutine tests run in an event loop of their own
+    if inspect.iscoroutinefunction(pyfuncitem.obj):
+        arguments = {name: pyfuncitem.funcargs[name] for name in pyfuncitem._fixtureinfo.argnames}
+        asyncio.run(pyfuncitem.obj(**arguments))
+        return True
+    return None
+
+
+@pytest.fixture(scope="session", autouse=True)
+def cognee_directories(tmp_path_factory):
+    import cognee
+
+    # add_nodes and add_edges record the changes in the relational database of cognee
+    cognee.config.system_root_directory(str(tmp_path_factory.mktemp("cognee_system")))
+    cognee.config.data_root_directory(str(tmp_path_factory.mktemp("cognee_data")))
+
+
+@pytest.fixture
+def open_adapter(tmp_path, monkeypatch):
+    """
+    Return a function creating a new adapter instance on the graph files in a temporary
+    directory, as a new process would.
+    """
+    monkeypatch.chdir(tmp_path)
+    adapters = []
+
+    def open_adapter(**kwargs) -> NetworkXAdapter:
+        NetworkXAdapter._instance = None
+        NetworkXAdapter._shards = None
+        adapter = NetworkXAdapter(None, None, None, **kwargs)
+        adapters.append(adapter)
+        return adapter
+
+    yield open_adapter
+
+    for adapter in adapters:
+        if adapter._executor is not None:
+            adapter._executor.shutdown()
+    NetworkXAdapter._instance = None
+    NetworkXAdapter._shards = None
+
+
+@pytest.fixture
+def adapter(open_adapter) -> NetworkXAdapter:
+    return open_adapter()
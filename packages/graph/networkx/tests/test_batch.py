@@ -0,0 +1,70 @@
+import pytest
+from cognee.infrastructure.engine import DataPoint
+
+from packages.graph.networkx.mutation_log import MutationLog
+
+
+class Entity(DataPoint):
+    name: str
+
+
+def graph_contents(graph):
+    return (
+        {node_id: data["name"] for node_id, data in graph.nodes(data=True)},
+        {edge[:3]: edge[3].get("weight") for edge in graph.edges(keys=True, data=True)},
+    )
+
+
+async def test_batch_is_persisted_with_a_single_log_write(open_adapter, monkeypatch):
+    adapter = open_adapter()
+    await adapter.load_graph_from_file()
+    first, second = Entity(name="first"), Entity(name="second")
+
+    appends = []
+    append_lines = MutationLog._append_lines
+
+    def counting_append_lines(log, lines):
+        appends.append(len(lines))
+        append_lines(log, lines)
+
+    monkeypatch.setattr(MutationLog, "_append_lines", counting_append_lines)
+
+    async with adapter.batch():
+        await adapter.add_nodes([first, second])
+        await adapter.add_edges([(first.id, second.id, "knows", {})])
+        # Nested batches join the outer one
+        async with adapter.batch():
+            await adapter.add_edge(second.id, first.id, "knows", {})
+
+    assert appends == [3]
+
+    restarted = open_adapter()
+    await restarted.load_graph_from_file()
+    assert graph_contents(restarted.graph) == graph_contents(adapter.graph)
+
+
+async def test_failed_batch_is_rolled_back_and_not_persisted(open_adapter):
+    adapter = open_adapter()
+    first, second, third = Entity(name="first"), Entity(name="second"), Entity(name="third")
+
+    await adapter.add_nodes([first, second])
+    await adapter.add_edges([(first.id, second.id, "knows", {"weight": 1})])
+    expected = graph_contents(adapter.graph)
+    sequence = adapter._mutation_log.sequence
+
+    with pytest.raises(RuntimeError):
+        async with adapter.batch():
+            await adapter.add_nodes([third, Entity(id=first.id, name="renamed")])
+            await adapter.add_edges(
+                [(second.id, third.id, "knows", {}), (first.id, second.id, "knows", {"weight": 2})]
+            )
+            await adapter.delete_node(second.id)
+            raise RuntimeError("abort the batch")
+
+    assert graph_contents(adapter.graph) == expected
+    assert adapter._mutation_log.sequence == sequence
+    assert await adapter.extract_nodes([second.id])
+
+    restarted = open_adapter()
+    await restarted.load_graph_from_file()
+    assert graph_contents(restarted.graph) == expected
@@ -0,0 +1,74 @@
+from datetime import datetime, timezone
+from uuid import UUID, uuid4
+
+import networkx as nx
+
+from packages.graph.networkx.binary_snapshot import is_binary_snapshot
+from packages.graph.networkx.graph_serialization import (
+    read_graph_file,
+    serialize_graph,
+    write_file_atomically,
+)
+
+
+def sample_graph() -> nx.MultiDiGraph:
+    person, city = uuid4(), uuid4()
+    uuid_string = str(uuid4())
+
+    graph = nx.MultiDiGraph()
+    graph.add_node(person, id=person, name="Alice", type="Person", updated_at=1700000000123)
+    graph.add_node(city, id=city, name="Paris", type="City", tags=["capital"], nested={"a": 1})
+    graph.add_node("type_person", id="type_person", name="Person", updated_at="2024-05-01T10:00:00")
+    graph.add_node(uuid_string, id=uuid_string, name="Imported")
+    graph.add_node(42, id=42, name="Numbered")
+
+    edge_time = datetime(2024, 5, 1, 10, 30, tzinfo=timezone.utc)
+    graph.add_edge(person, city, key="lives_in", relationship_name="lives_in", updated_at=edge_time)
+    graph.add_edge(person, "type_person", key="is_a", relationship_name="is_a", weight=0.5)
+    graph.add_edge(uuid_string, 42, key="links", relationship_name="links")
+    graph.add_edge(person, city, key="visited", relationship_name="visited")
+    return graph
+
+
+def load(graph, snapshot_format, file_path):
+    write_file_atomically(str(file_path), serialize_graph(graph, snapshot_format, 7))
+    return read_graph_file(str(file_path))
+
+
+def test_binary_and_json_snapshots_load_the_same_graph(tmp_path):
+    graph = sample_graph()
+
+    json_graph, json_sequence, _ = load(graph, "json", tmp_path / "graph.json")
+    binary_graph, binary_sequence, _ = load(graph, "binary", tmp_path / "graph.bin")
+
+    assert is_binary_snapshot(str(tmp_path / "graph.bin"))
+    assert not is_binary_snapshot(str(tmp_path / "graph.json"))
+    assert json_sequence == binary_sequence == 7
+
+    assert list(binary_graph.nodes(data=True)) == list(json_graph.nodes(data=True))
+    assert list(binary_graph.edges(keys=True, data=True)) == list(
+        json_graph.edges(keys=True, data=True)
+    )
+
+
+def test_binary_snapshot_parses_identifiers_and_timestamps(tmp_path):
+    graph = sample_graph()
+    uuid_string = next(node for node in graph.nodes if isinstance(node, str) and "-" in node)
+
+    loaded, _, _ = load(graph, "binary", tmp_path / "graph.bin")
+
+    # Identifiers that look like UUIDs are parsed, anything else is kept as it was
+    assert UUID(uuid_string) in loaded
+    assert "type_person" in loaded and 42 in loaded
+
+    timestamps = [data.get("updated_at") for _, data in loaded.nodes(data=True)]
+    assert timestamps[0] == datetime.fromtimestamp(1700000000.123, tz=timezone.utc)
+    assert timestamps[1] is None
+    assert timestamps[2] == datetime(2024, 5, 1, 10, 0)
+
+
+def test_empty_graph_round_trip(tmp_path):
+    loaded, sequence, _ = load(nx.MultiDiGraph(), "binary", tmp_path / "graph.bin")
+
+    assert loaded.number_of_nodes() == 0 and loaded.number_of_edges() == 0
+    assert sequence == 7
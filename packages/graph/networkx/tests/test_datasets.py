@@ -0,0 +1,72 @@
+import asyncio
+import os
+from uuid import uuid4
+
+import pytest
+from cognee.infrastructure.engine import DataPoint
+
+
+class Entity(DataPoint):
+    name: str
+
+
+async def node_names(adapter):
+    return sorted(node["name"] for node in await adapter.get_nodes())
+
+
+async def test_datasets_have_separate_graphs_and_files(open_adapter):
+    adapter = open_adapter()
+    dataset_id = uuid4()
+
+    with adapter.use_dataset("first"):
+        await adapter.add_nodes([Entity(name="first dataset")])
+        # Tasks started inside the block use the dataset as well
+        await asyncio.create_task(adapter.add_nodes([Entity(name="first dataset task")]))
+    with adapter.use_dataset(dataset_id):
+        await adapter.add_nodes([Entity(name="second dataset")])
+    await adapter.add_nodes([Entity(name="default")])
+
+    assert os.path.exists(os.path.join("cognee_graphs", "first.pkl.wal"))
+    assert os.path.exists(os.path.join("cognee_graphs", f"{dataset_id}.pkl.wal"))
+
+    for current in (adapter, open_adapter()):
+        with current.use_dataset("first"):
+            assert await node_names(current) == ["first dataset", "first dataset task"]
+        with current.use_dataset(str(dataset_id)):
+            assert await node_names(current) == ["second dataset"]
+        assert await node_names(current) == ["default"]
+
+
+async def test_least_recently_used_graphs_are_unloaded(open_adapter):
+    adapter = open_adapter(max_loaded_graph_size=2)
+
+    with adapter.use_dataset("first"):
+        await adapter.add_nodes([Entity(name="first")])
+    with adapter.use_dataset("second"):
+        await adapter.add_nodes([Entity(name="second"), Entity(name="third")])
+    with adapter.use_dataset("third"):
+        await adapter.get_nodes()
+
+    assert adapter._shards["first"].graph is None
+    assert adapter._shards["second"].graph is not None
+
+    # Unloaded graphs are loaded again on their next use
+    with adapter.use_dataset("first"):
+        assert await node_names(adapter) == ["first"]
+
+
+async def test_batch_cannot_span_datasets(adapter):
+    with pytest.raises(RuntimeError):
+        async with adapter.batch():
+            await adapter.add_nodes([Entity(name="default")])
+            with adapter.use_dataset("first"):
+                await adapter.add_nodes([Entity(name="first")])
+
+    assert await node_names(adapter) == []
+
+
+@pytest.mark.parametrize("dataset", ["..", "../outside", "nested/dataset", ""])
+def test_dataset_names_must_be_file_names(adapter, dataset):
+    with pytest.raises(ValueError):
+        with adapter.use_dataset(dataset):
+            pass
@@ -0,0 +1,75 @@
+import time
+import asyncio
+import threading
+
+from cognee.infrastructure.engine import DataPoint
+
+from packages.graph.networkx.mutation_log import MutationLog
+
+
+class Entity(DataPoint):
+    name: str
+
+
+def logged_mutations(adapter):
+    return len(list(adapter._mutation_log.read()))
+
+
+async def test_mutations_are_written_after_the_flush_interval(open_adapter):
+    adapter = open_adapter(flush_interval=0.2)
+    await adapter.load_graph_from_file()
+
+    await adapter.add_nodes([Entity(name="first")])
+    await adapter.add_nodes([Entity(name="second")])
+    assert logged_mutations(adapter) == 0
+
+    await asyncio.sleep(0.5)
+    assert logged_mutations(adapter) == 2
+    assert adapter._mutation_log.flushed_sequence == adapter._mutation_log.sequence
+
+
+async def test_mutations_are_written_once_flush_max_mutations_are_staged(open_adapter):
+    adapter = open_adapter(flush_interval=60, flush_max_mutations=3)
+    await adapter.load_graph_from_file()
+
+    for name in ("first", "second"):
+        await adapter.add_nodes([Entity(name=name)])
+    assert logged_mutations(adapter) == 0
+
+    await adapter.add_nodes([Entity(name="third")])
+    assert logged_mutations(adapter) == 3
+
+
+async def test_mutations_staged_during_a_flush_are_written(open_adapter, monkeypatch):
+    adapter = open_adapter(flush_interval=0.05)
+    await adapter.load_graph_from_file()
+
+    writing = threading.Event()
+    append_lines = MutationLog._append_lines
+
+    def slow_append_lines(log, lines):
+        writing.set()
+        time.sleep(0.3)
+        append_lines(log, lines)
+
+    monkeypatch.setattr(MutationLog, "_append_lines", slow_append_lines)
+
+    await adapter.add_nodes([Entity(name="first")])
+    await asyncio.to_thread(writing.wait, 5)
+    # Staged while the background flush is still writing the first mutation
+    await adapter.add_nodes([Entity(name="second")])
+
+    await asyncio.sleep(1)
+    assert logged_mutations(adapter) == 2
+    assert adapter._mutation_log.flushed_sequence == adapter._mutation_log.sequence == 2
+
+
+async def test_close_writes_staged_mutations(open_adapter):
+    adapter = open_adapter(flush_interval=60)
+    await adapter.load_graph_from_file()
+
+    await adapter.add_nodes([Entity(name="first")])
+    assert logged_mutations(adapter) == 0
+
+    await adapter.close()
+    assert logged_mutations(adapter) == 1
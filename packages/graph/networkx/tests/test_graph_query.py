@@ -0,0 +1,146 @@
+from uuid import uuid4
+
+import networkx as nx
+import pytest
+from cognee.infrastructure.engine import DataPoint
+
+from packages.graph.networkx.attribute_index import AttributeIndex
+from packages.graph.networkx.graph_query import compile_query
+
+
+class Entity(DataPoint):
+    name: str
+
+
+@pytest.fixture
+def graph():
+    graph = nx.MultiDiGraph()
+    nodes = {
+        "cognee": {"type": "Entity", "name": "cognee"},
+        "networkx": {"type": "Entity", "name": "networkx"},
+        "chunk 1": {"type": "DocumentChunk", "text": "cognee builds graphs", "size": 3},
+        "chunk 2": {"type": "DocumentChunk", "text": "networkx stores graphs", "size": 5},
+        "document": {"type": "Document", "name": "readme"},
+    }
+    for name, data in nodes.items():
+        node_id = uuid4()
+        graph.add_node(node_id, id=node_id, **data)
+        nodes[name] = node_id
+
+    edges = [
+        ("chunk 1", "cognee", "mentions"),
+        ("chunk 2", "networkx", "mentions"),
+        ("chunk 2", "cognee", "mentions"),
+        ("chunk 1", "document", "is_part_of"),
+        ("chunk 2", "document", "is_part_of"),
+        ("cognee", "networkx", "uses"),
+    ]
+    for source, target, relationship_name in edges:
+        graph.add_edge(
+            nodes[source],
+            nodes[target],
+            key=relationship_name,
+            relationship_name=relationship_name,
+            weight=len(source),
+        )
+
+    graph.graph["ids"] = nodes
+    return graph
+
+
+def run(graph, query, params=None, indexed=True):
+    index = AttributeIndex.build(graph, ("type", "name")) if indexed else None
+    return compile_query(query).execute(graph, index, params)
+
+
+@pytest.mark.parametrize("indexed", [True, False])
+def test_pattern_with_conditions_and_aliases(graph, indexed):
+    records = run(
+        graph,
+        "MATCH (a:Entity {name: $name})<-[r:mentions]-(b) WHERE b.type = 'DocumentChunk' "
+        "RETURN a.name, r.relationship_name AS relationship, b.text AS text",
+        {"name": "cognee"},
+        indexed,
+    )
+
+    assert sorted(records, key=lambda record: record["text"]) == [
+        {"a.name": "cognee", "relationship": "mentions", "text": "cognee builds graphs"},
+        {"a.name": "cognee", "relationship": "mentions", "text": "networkx stores graphs"},
+    ]
+
+
+def test_two_relationships_in_both_directions(graph):
+    records = run(
+        graph,
+        "MATCH (d:Document)<-[:is_part_of]-(c)-[:mentions|uses]-(e:Entity) "
+        "WHERE e.name STARTS WITH 'net' RETURN c.text, e.name",
+    )
+
+    assert records == [{"c.text": "networkx stores graphs", "e.name": "networkx"}]
+
+
+@pytest.mark.parametrize(
+    "condition, texts",
+    [
+        ("c.size > 3", ["networkx stores graphs"]),
+        ("c.size <> 3", ["networkx stores graphs"]),
+        ("c.size IN [1, 3]", ["cognee builds graphs"]),
+        ("c.text CONTAINS 'builds'", ["cognee builds graphs"]),
+        ("c.text ENDS WITH 'graphs'", ["cognee builds graphs", "networkx stores graphs"]),
+        ("c.name IS NULL", ["cognee builds graphs", "networkx stores graphs"]),
+        ("c.name IS NOT NULL", []),
+    ],
+)
+def test_where_conditions(graph, condition, texts):
+    records = run(graph, f"MATCH (c:DocumentChunk) WHERE {condition} RETURN c.text")
+
+    assert sorted(record["c.text"] for record in records) == texts
+
+
+def test_node_ids_and_limit(graph):
+    chunk_id = graph.graph["ids"]["chunk 2"]
+
+    records = run(
+        graph,
+        "MATCH (c {id: $id})-[r]->(n) RETURN n, r.weight LIMIT $limit",
+        {"id": str(chunk_id), "limit": 2},
+    )
+
+    assert len(records) == 2
+    assert all(record["r.weight"] == len("chunk 2") for record in records)
+    assert all(record["n"]["id"] in graph.successors(chunk_id) for record in records)
+
+
+def test_parsed_queries_are_cached():
+    query = "MATCH (n:Entity) RETURN n"
+
+    assert compile_query(query) is compile_query(query)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "MATCH (n) RETURN m",
+        "MATCH (n)-[r]->(n) RETURN n",
+        "MATCH (a)-->(b)-->(c)-->(d) RETURN a",
+        "MATCH (a)<-[r]->(b) RETURN a",
+        "MATCH (n) WHERE n.name ~ 'x' RETURN n",
+        "MATCH (n) RETURN n LIMIT -1",
+        "MATCH (n {name: $name}) RETURN n",
+        "CREATE (n) RETURN n",
+        "MATCH (n) RETURN n ORDER BY n.name",
+    ],
+)
+def test_unsupported_queries_raise_value_error(graph, query):
+    with pytest.raises(ValueError):
+        run(graph, query)
+
+
+async def test_adapter_query(adapter):
+    first, second = Entity(name="first"), Entity(name="second")
+    await adapter.add_nodes([first, second])
+    await adapter.add_edge(first.id, second.id, "knows", {})
+
+    records = await adapter.query("MATCH (a:Entity)-[:knows]->(b:Entity) RETURN a.name, b.name")
+
+    assert records == [{"a.name": "first", "b.name": "second"}]
@@ -0,0 +1,98 @@
+import os
+
+from cognee.infrastructure.engine import DataPoint
+
+from packages.graph.networkx.mutation_log import MutationLog
+
+
+class Entity(DataPoint):
+    name: str
+
+
+def graph_contents(graph):
+    return (
+        {node_id: data["name"] for node_id, data in graph.nodes(data=True)},
+        set(graph.edges(keys=True)),
+    )
+
+
+async def test_mutations_are_replayed_after_restart(open_adapter):
+    adapter = open_adapter()
+    first, second, third = Entity(name="first"), Entity(name="second"), Entity(name="third")
+
+    await adapter.add_nodes([first, second, third])
+    await adapter.add_edges([(first.id, second.id, "knows", {}), (second.id, third.id, "knows", {})])
+    await adapter.delete_node(third.id)
+    expected = graph_contents(adapter.graph)
+
+    # Only the initial empty snapshot was written, everything else is in the log
+    assert os.path.exists("cognee_graph.pkl.wal")
+
+    restarted = open_adapter()
+    await restarted.load_graph_from_file()
+
+    assert graph_contents(restarted.graph) == expected
+    assert expected == ({first.id: "first", second.id: "second"}, {(first.id, second.id, "knows")})
+
+
+async def test_snapshot_sequence_skips_compacted_entries(open_adapter):
+    adapter = open_adapter(mutation_log_compaction_threshold=3)
+    entities = [Entity(name=f"entity {number}") for number in range(4)]
+
+    for entity in entities[:3]:
+        await adapter.add_nodes([entity])
+    await adapter.close()
+
+    # The compaction moved the first mutations into the snapshot
+    assert not os.path.exists("cognee_graph.pkl.wal")
+
+    # Stays below the threshold, so these mutations are only in the log
+    await adapter.add_nodes([entities[3]])
+    await adapter.add_edges([(entities[0].id, entities[3].id, "follows", {})])
+    expected = graph_contents(adapter.graph)
+
+    log = MutationLog("cognee_graph.pkl.wal")
+    assert [sequence for sequence, _, _ in log.read()] == [4, 5]
+
+    restarted = open_adapter()
+    await restarted.load_graph_from_file()
+
+    assert graph_contents(restarted.graph) == expected
+    assert len(expected[0]) == 4
+    assert restarted._mutation_log.sequence == adapter._mutation_log.sequence
+
+
+async def test_partial_entry_left_by_crash_does_not_swallow_later_entries(open_adapter):
+    adapter = open_adapter()
+    before, after = Entity(name="before crash"), Entity(name="after crash")
+
+    await adapter.add_nodes([before])
+
+    # A crash in the middle of an append leaves an entry without its newline
+    with open("cognee_graph.pkl.wal", "a", encoding="utf-8") as file:
+        file.write('{"seq": 2, "op": "add_nodes", "items": [["')
+
+    restarted = open_adapter()
+    await restarted.load_graph_from_file()
+    await restarted.add_nodes([after])
+
+    restarted_again = open_adapter()
+    await restarted_again.load_graph_from_file()
+
+    assert set(restarted_again.graph.nodes) == {before.id, after.id}
+
+
+async def test_append_after_failed_write_starts_a_new_line(tmp_path):
+    log = MutationLog(str(tmp_path / "graph.wal"))
+
+    log.stage("remove_nodes", ["first"])
+    await log.flush()
+
+    with open(log.file_path, "a", encoding="utf-8") as file:
+        file.write('{"seq": 2, "op": "remo')
+
+    log.stage("remove_nodes", ["second"])
+    await log.flush()
+
+    # The partial entry is on a line of its own, which is skipped
+    assert [items for _, _, items in log.read()] == [["first"], ["second"]]
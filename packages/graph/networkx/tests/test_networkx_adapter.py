@@ -0,0 +1,109 @@
+import pytest
+from cognee.infrastructure.engine import DataPoint
+from cognee.modules.graph.cognee_graph.CogneeGraph import CogneeGraph
+
+
+class Entity(DataPoint):
+    name: str
+
+
+async def test_graph_data_is_projected_after_adding_edges(open_adapter):
+    adapter = open_adapter()
+    first, second, third = Entity(name="first"), Entity(name="second"), Entity(name="third")
+
+    await adapter.add_nodes([first, second, third])
+    # Endpoints are given as UUIDs and as strings, both refer to the nodes keyed by UUID
+    await adapter.add_edges(
+        [(first.id, second.id, "knows", {}), (str(second.id), str(third.id), "knows", {})]
+    )
+    await adapter.add_edge(str(third.id), first.id, "follows", {})
+
+    nodes, edges = await adapter.get_graph_data()
+
+    assert {node_id for node_id, _ in nodes} == {first.id, second.id, third.id}
+    assert {edge[:3] for edge in edges} == {
+        (first.id, second.id, "knows"),
+        (second.id, third.id, "knows"),
+        (third.id, first.id, "follows"),
+    }
+
+    graph = CogneeGraph()
+    await graph.project_graph_from_db(
+        adapter, node_properties_to_project=["name"], edge_properties_to_project=[]
+    )
+    assert len(graph.nodes) == 3
+    assert len(graph.edges) == 3
+
+    # The same graph as after loading it from disk
+    restarted = open_adapter()
+    reloaded_nodes, reloaded_edges = await restarted.get_graph_data()
+
+    assert {node_id for node_id, _ in reloaded_nodes} == {node_id for node_id, _ in nodes}
+    assert {edge[:3] for edge in reloaded_edges} == {edge[:3] for edge in edges}
+
+
+async def test_edges_of_one_call_share_a_timestamp(open_adapter):
+    adapter = open_adapter()
+    first, second, third = Entity(name="first"), Entity(name="second"), Entity(name="third")
+
+    await adapter.add_nodes([first, second, third])
+    await adapter.add_edges(
+        [
+            (first.id, second.id, "knows", {"weight": 1}),
+            (second.id, third.id, "knows"),
+            (third.id, first.id, "follows", {}),
+        ]
+    )
+
+    timestamps = {data["updated_at"] for *_, data in adapter.graph.edges(keys=True, data=True)}
+    assert len(timestamps) == 1
+    assert adapter.graph.edges[first.id, second.id, "knows"]["weight"] == 1
+
+
+async def test_edges_are_added_from_columns(open_adapter):
+    adapter = open_adapter()
+    first, second, third = Entity(name="first"), Entity(name="second"), Entity(name="third")
+
+    await adapter.add_nodes([first, second, third])
+    await adapter.add_edges_from_columns(
+        [first.id, str(second.id)],
+        [second.id, third.id],
+        ["knows", "follows"],
+        [{"weight": 1}, {"weight": 2}],
+    )
+
+    assert {
+        edge[:3]: edge[3]["weight"] for edge in adapter.graph.edges(keys=True, data=True)
+    } == {(first.id, second.id, "knows"): 1, (second.id, third.id, "follows"): 2}
+
+    with pytest.raises(ValueError):
+        await adapter.add_edges_from_columns([first.id], [second.id, third.id], ["knows"])
+
+
+async def test_has_edges_keeps_the_input_order(open_adapter):
+    adapter = open_adapter()
+    first, second, third = Entity(name="first"), Entity(name="second"), Entity(name="third")
+
+    await adapter.add_nodes([first, second, third])
+    await adapter.add_edges(
+        [
+            (first.id, second.id, "knows", {}),
+            (first.id, third.id, "knows", {}),
+            (second.id, third.id, "knows", {}),
+        ]
+    )
+
+    # Candidates of the same source are interleaved with others and with missing edges
+    candidates = [
+        (first.id, third.id, "knows"),
+        (second.id, third.id, "knows"),
+        (third.id, first.id, "knows"),
+        (first.id, second.id, "follows"),
+        (first.id, second.id, "knows"),
+    ]
+
+    assert await adapter.has_edges(candidates) == [
+        (first.id, third.id, "knows"),
+        (second.id, third.id, "knows"),
+        (first.id, second.id, "knows"),
+    ]
@@ -0,0 +1,128 @@
+import asyncio
+import contextvars
+import threading
+
+import pytest
+from cognee.infrastructure.engine import DataPoint
+
+from packages.graph.networkx import networkx_adapter
+from packages.graph.networkx.graph_serialization import read_graph_file
+from packages.graph.networkx.read_write_lock import ReadWriteLock
+
+
+class Entity(DataPoint):
+    name: str
+
+
+def run_detached(coroutine):
+    # Tasks inherit the context, which would make them share the lock held by the test
+    return asyncio.create_task(coroutine, context=contextvars.Context())
+
+
+async def test_readers_share_the_lock_and_writers_hold_it_exclusively():
+    lock = ReadWriteLock()
+    events = []
+
+    async def reader(name):
+        async with lock.read():
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    async def writer(name):
+        async with lock.write():
+            events.append(f"{name} start")
+            await asyncio.sleep(0.01)
+            events.append(f"{name} end")
+
+    await asyncio.gather(reader("r1"), reader("r2"), writer("w1"), reader("r3"))
+
+    # The second reader joins the first, the writer waits for both, and the reader queued
+    # behind the writer is not let in ahead of it
+    assert events == [
+        "r1 start",
+        "r2 start",
+        "r1 end",
+        "r2 end",
+        "w1 start",
+        "w1 end",
+        "r3 start",
+        "r3 end",
+    ]
+    assert not lock.in_use
+
+
+async def test_lock_is_reentrant_but_cannot_be_upgraded():
+    lock = ReadWriteLock()
+
+    async with lock.write():
+        async with lock.read():
+            async with lock.write():
+                assert lock.locked
+
+    async with lock.read():
+        with pytest.raises(RuntimeError):
+            async with lock.write():
+                pass
+
+    assert not lock.locked
+
+
+async def test_cancelled_waiter_releases_its_place():
+    lock = ReadWriteLock()
+    reading = asyncio.Event()
+
+    async def write():
+        async with lock.write():
+            pass
+
+    async def read():
+        async with lock.read():
+            reading.set()
+
+    async with lock.read():
+        waiting_writer = run_detached(write())
+        await asyncio.sleep(0)
+        waiting_reader = run_detached(read())
+        await asyncio.sleep(0)
+        assert not reading.is_set()
+
+        waiting_writer.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await waiting_writer
+
+        # The reader queued behind the cancelled writer joins the current reader
+        await asyncio.wait_for(reading.wait(), 1)
+
+    await waiting_reader
+    assert not lock.in_use
+
+
+async def test_mutations_are_not_blocked_while_a_snapshot_is_serialized(adapter, monkeypatch):
+    first, second = Entity(name="first"), Entity(name="second")
+    await adapter.add_nodes([first])
+
+    serializing, resume = threading.Event(), threading.Event()
+    serialize_graph = networkx_adapter.serialize_graph
+
+    def blocking_serialize_graph(*args):
+        serializing.set()
+        resume.wait(10)
+        return serialize_graph(*args)
+
+    monkeypatch.setattr(networkx_adapter, "serialize_graph", blocking_serialize_graph)
+
+    save = asyncio.create_task(adapter.save_graph_to_file())
+    await asyncio.to_thread(serializing.wait, 10)
+
+    await asyncio.wait_for(adapter.add_nodes([second]), 10)
+    assert await adapter.extract_nodes([second.id])
+
+    resume.set()
+    snapshot_sequence = await save
+
+    # The snapshot holds the graph as it was when the save started
+    graph, stored_sequence, _ = read_graph_file(adapter.filename)
+    assert set(graph.nodes) == {first.id}
+    assert stored_sequence == snapshot_sequence < adapter._mutation_log.sequence
+    assert set(adapter.graph.nodes) == {first.id, second.id}
@@ -0,0 +1,42 @@
+import pytest
+from cognee.infrastructure.engine import DataPoint
+
+from packages.graph.networkx.mutation_log import MutationLog
+
+
+class Entity(DataPoint):
+    name: str
+
+
+def graph_contents(graph):
+    return (
+        {node_id: data["name"] for node_id, data in graph.nodes(data=True)},
+        set(graph.edges(keys=True)),
+    )
+
+
+@pytest.mark.parametrize("snapshot_format", ["json", "binary"])
+async def test_snapshot_round_trip_in_worker_process(open_adapter, snapshot_format):
+    adapter = open_adapter(serialization_executor="process", snapshot_format=snapshot_format)
+    entities = [Entity(name=f"entity {number}") for number in range(3)]
+
+    await adapter.add_nodes(entities)
+    await adapter.add_edges(
+        [(entities[0].id, entities[1].id, "knows", {}), (entities[1].id, entities[2].id, "knows", {})]
+    )
+    # Written and truncated like a compaction, so the reload only reads the snapshot
+    snapshot_sequence = await adapter.save_graph_to_file()
+    await adapter._mutation_log.truncate(snapshot_sequence)
+    assert not list(MutationLog("cognee_graph.pkl.wal").read())
+    expected = graph_contents(adapter.graph)
+
+    restarted = open_adapter(serialization_executor="process")
+    await restarted.load_graph_from_file()
+
+    assert graph_contents(restarted.graph) == expected
+    assert restarted._executor_kind == "process"
+
+
+def test_unknown_serialization_executor_is_rejected(open_adapter):
+    with pytest.raises(ValueError):
+        open_adapter(serialization_executor="cluster")
@@ -0,0 +1,79 @@
+import pytest
+from cognee.infrastructure.engine import DataPoint
+
+
+class Entity(DataPoint):
+    name: str
+
+
+async def collect(stream):
+    return [page async for page in stream]
+
+
+async def add_entities(adapter):
+    entities = [Entity(name=f"entity {number}") for number in range(5)]
+    await adapter.add_nodes(entities)
+    await adapter.add_edges(
+        [(source.id, target.id, "follows", {}) for source, target in zip(entities, entities[1:])]
+    )
+
+
+async def test_graph_data_pages_match_get_graph_data(adapter):
+    await add_entities(adapter)
+    nodes, edges = await adapter.get_graph_data()
+
+    pages = await collect(adapter.stream_graph_data(page_size=2))
+
+    assert [(section, len(page)) for section, page, _ in pages] == [
+        ("nodes", 2),
+        ("nodes", 2),
+        ("nodes", 1),
+        ("edges", 2),
+        ("edges", 2),
+    ]
+    assert [item for section, page, _ in pages if section == "nodes" for item in page] == nodes
+    assert [item for section, page, _ in pages if section == "edges" for item in page] == edges
+
+
+async def test_stream_resumes_after_cursor(adapter):
+    await add_entities(adapter)
+    pages = await collect(adapter.stream_graph_data(page_size=2))
+
+    for position, (_, _, cursor) in enumerate(pages):
+        resumed = await collect(adapter.stream_graph_data(page_size=2, cursor=cursor))
+        assert [page for _, page, _ in resumed] == [page for _, page, _ in pages[position + 1 :]]
+
+
+async def test_node_pages_match_get_nodes(adapter):
+    await add_entities(adapter)
+    pages = await collect(adapter.stream_nodes(page_size=3))
+
+    assert [node for page, _ in pages for node in page] == await adapter.get_nodes()
+    assert [cursor for _, cursor in pages] == ["nodes:3", "nodes:5"]
+
+
+async def test_stream_continues_after_graph_changes(adapter):
+    await add_entities(adapter)
+    stream = adapter.stream_nodes(page_size=2)
+    first_page, _ = await anext(stream)
+
+    await adapter.delete_node(first_page[0]["id"])
+    remaining = [node async for page, _ in stream for node in page]
+
+    # The stream continues at the same offset of the changed graph, so the node that moved
+    # into the first page is skipped
+    nodes = await adapter.get_nodes()
+    assert remaining == nodes[2:]
+
+
+@pytest.mark.parametrize("cursor", ["edges:1", "nodes:x", "nodes", "vertices:0"])
+async def test_invalid_cursors_are_rejected(adapter, cursor):
+    await add_entities(adapter)
+    with pytest.raises(ValueError):
+        await collect(adapter.stream_nodes(cursor=cursor))
+
+
+async def test_page_size_must_be_positive(adapter):
+    await add_entities(adapter)
+    with pytest.raises(ValueError):
+        await collect(adapter.stream_graph_data(page_size=0))
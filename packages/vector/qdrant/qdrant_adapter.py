@@ -1,4 +1,6 @@
-from typing import Dict, List, Optional
+import time
+import asyncio
+from typing import Dict, List, Optional, Set
 from qdrant_client import AsyncQdrantClient, models
 
 from cognee.exceptions import InvalidValueError
@@ -23,30 +25,117 @@ class IndexSchema(DataPoint):
 
 def create_hnsw_config(hnsw_config: Dict):
     if hnsw_config is not None:
-        return models.HnswConfig()
+        return models.HnswConfigDiff(**hnsw_config)
     return None
 
 
 def create_optimizers_config(optimizers_config: Dict):
     if optimizers_config is not None:
-        return models.OptimizersConfig()
+        return models.OptimizersConfigDiff(**optimizers_config)
     return None
 
 
 def create_quantization_config(quantization_config: Dict):
+    # Quantization is configured as in the Qdrant API, e.g. {"scalar": {"type": "int8"}},
+    # {"product": {"compression": "x16"}} or {"binary": {"always_ram": True}}
     if quantization_config is not None:
-        return models.QuantizationConfig()
+        if "scalar" in quantization_config:
+            return models.ScalarQuantization(**quantization_config)
+        if "product" in quantization_config:
+            return models.ProductQuantization(**quantization_config)
+        if "binary" in quantization_config:
+            return models.BinaryQuantization(**quantization_config)
+
+        raise InvalidValueError(
+            message="Quantization config must have one of the keys scalar, product or binary!"
+        )
     return None
 
 
+def create_search_params(
+    hnsw_ef: Optional[int] = None,
+    rescore: Optional[bool] = None,
+    oversampling: Optional[float] = None,
+):
+    if hnsw_ef is None and rescore is None and oversampling is None:
+        return None
+
+    quantization = None
+    if rescore is not None or oversampling is not None:
+        quantization = models.QuantizationSearchParams(rescore=rescore, oversampling=oversampling)
+
+    return models.SearchParams(hnsw_ef=hnsw_ef, quantization=quantization)
+
+
+def to_scored_result(point: models.ScoredPoint) -> ScoredResult:
+    # Qdrant scores are cosine similarities, results carry the distance instead
+    return ScoredResult(
+        id=parse_id(point.id),
+        payload={
+            **point.payload,
+            "id": parse_id(point.id),
+        },
+        score=1 - point.score,
+    )
+
+
+def is_collection_not_found(error: Exception) -> bool:
+    import grpc
+    from qdrant_client.http.exceptions import UnexpectedResponse
+
+    if isinstance(error, UnexpectedResponse):
+        return error.status_code == 404 or "Collection not found" in str(error)
+    if isinstance(error, grpc.RpcError):
+        return error.code() == grpc.StatusCode.NOT_FOUND
+    # The local client reports missing collections with a ValueError
+    return isinstance(error, ValueError) and "not found" in str(error)
+
+
 class QDrantAdapter(VectorDBInterface):
     name = "Qdrant"
     url: str = None
     api_key: str = None
     qdrant_path: str = None
 
-    def __init__(self, url, api_key, embedding_engine: EmbeddingEngine, qdrant_path=None):
+    def __init__(
+        self,
+        url,
+        api_key,
+        embedding_engine: EmbeddingEngine,
+        qdrant_path=None,
+        prefer_grpc: bool = False,
+        pool_size: Optional[int] = None,
+        upload_batch_size: int = 256,
+        upload_parallelism: int = 4,
+        upload_wait: bool = True,
+        hnsw_config: Optional[Dict] = None,
+        optimizers_config: Optional[Dict] = None,
+        quantization_config: Optional[Dict] = None,
+        on_disk: Optional[bool] = None,
+    ):
         self.embedding_engine = embedding_engine
+        # Use the gRPC interface of a Qdrant server for all requests that support it
+        self.prefer_grpc = prefer_grpc
+        # Maximum number of connections the client keeps open to a Qdrant server
+        self.pool_size = pool_size
+        # Data points are upserted in batches of this size, with at most `upload_parallelism`
+        # requests in flight. With `upload_wait` every request returns only once its points
+        # are applied, so they are searchable when create_data_points returns.
+        self.upload_batch_size = upload_batch_size
+        self.upload_parallelism = upload_parallelism
+        self.upload_wait = upload_wait
+        # Index, optimizer and quantization settings of the collections the adapter creates,
+        # built up front so invalid settings fail here rather than on the first collection
+        self.hnsw_config = create_hnsw_config(hnsw_config)
+        self.optimizers_config = create_optimizers_config(optimizers_config)
+        self.quantization_config = create_quantization_config(quantization_config)
+        # Keep the original vectors on disk instead of in memory
+        self.on_disk = on_disk
+        self._client = None
+        # Names of the collections known to exist. They are added by has_collection and
+        # create_collection and dropped when Qdrant reports the collection missing, so
+        # searching a known collection skips the collection_exists request.
+        self._collections: Set[str] = set()
 
         if qdrant_path is not None:
             self.qdrant_path = qdrant_path
@@ -55,73 +144,139 @@ class QDrantAdapter(VectorDBInterface):
             self.api_key = api_key
 
     def get_qdrant_client(self) -> AsyncQdrantClient:
+        # One client is shared by all calls, so its connections are reused instead of being
+        # opened for every request. It is created on first use and released by close().
+        if self._client is None:
+            self._client = self._create_qdrant_client()
+        return self._client
+
+    def _create_qdrant_client(self) -> AsyncQdrantClient:
         if self.qdrant_path is not None:
             return AsyncQdrantClient(path=self.qdrant_path, port=6333)
         elif self.url is not None:
-            return AsyncQdrantClient(url=self.url, api_key=self.api_key, port=6333)
+            return AsyncQdrantClient(
+                url=self.url,
+                api_key=self.api_key,
+                port=6333,
+                prefer_grpc=self.prefer_grpc,
+                pool_size=self.pool_size,
+            )
 
         return AsyncQdrantClient(location=":memory:")
 
+    async def close(self):
+        if self._client is not None:
+            client, self._client = self._client, None
+            await client.close()
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_value, traceback):
+        await self.close()
+
     async def embed_data(self, data: List[str]) -> List[float]:
         return await self.embedding_engine.embed_text(data)
 
     async def has_collection(self, collection_name: str) -> bool:
+        if collection_name in self._collections:
+            return True
+
+        client = self.get_qdrant_client()
+        if not await client.collection_exists(collection_name):
+            return False
+
+        self._collections.add(collection_name)
+        return True
+
+    async def _count_points(self, collection_name: str) -> int:
+        # Not cached, other processes may have added or deleted points since the last count
         client = self.get_qdrant_client()
-        result = await client.collection_exists(collection_name)
-        await client.close()
-        return result
+        return (await client.count(collection_name=collection_name)).count
 
     async def create_collection(
         self,
         collection_name: str,
         payload_schema=None,
     ):
+        if collection_name in self._collections:
+            return
+
         client = self.get_qdrant_client()
 
+        vector_size = self.embedding_engine.get_vector_size()
+
         if not await client.collection_exists(collection_name):
             await client.create_collection(
                 collection_name=collection_name,
                 vectors_config={
                     "text": models.VectorParams(
-                        size=self.embedding_engine.get_vector_size(), distance="Cosine"
+                        size=vector_size,
+                        distance="Cosine",
+                        on_disk=self.on_disk,
                     )
                 },
+                hnsw_config=self.hnsw_config,
+                optimizers_config=self.optimizers_config,
+                quantization_config=self.quantization_config,
             )
 
-        await client.close()
+        self._collections.add(collection_name)
 
     async def create_data_points(self, collection_name: str, data_points: List[DataPoint]):
-        from qdrant_client.http.exceptions import UnexpectedResponse
-
         client = self.get_qdrant_client()
 
         data_vectors = await self.embed_data(
             [DataPoint.get_embeddable_data(data_point) for data_point in data_points]
         )
 
-        def convert_to_qdrant_point(data_point: DataPoint):
-            return models.PointStruct(
-                id=str(data_point.id),
-                payload=data_point.model_dump(),
-                vector={"text": data_vectors[data_points.index(data_point)]},
+        ids = [str(data_point.id) for data_point in data_points]
+        payloads = [data_point.model_dump() for data_point in data_points]
+
+        # Columnar batches are serialized as they are, while the client inspects every value
+        # of a list of point structs for objects it has to embed
+        batches = [
+            models.Batch(
+                ids=ids[start : start + self.upload_batch_size],
+                payloads=payloads[start : start + self.upload_batch_size],
+                vectors={"text": data_vectors[start : start + self.upload_batch_size]},
             )
+            for start in range(0, len(data_points), self.upload_batch_size)
+        ]
+        semaphore = asyncio.Semaphore(self.upload_parallelism)
 
-        points = [convert_to_qdrant_point(point) for point in data_points]
+        async def upsert_batch(batch_number: int, batch: models.Batch):
+            async with semaphore:
+                start_time = time.perf_counter()
+                await client.upsert(
+                    collection_name=collection_name, points=batch, wait=self.upload_wait
+                )
+                logger.debug(
+                    "Upserted batch %d/%d (%d points) into %s in %.3f s",
+                    batch_number + 1,
+                    len(batches),
+                    len(batch.ids),
+                    collection_name,
+                    time.perf_counter() - start_time,
+                )
 
         try:
-            client.upload_points(collection_name=collection_name, points=points)
-        except UnexpectedResponse as error:
-            if "Collection not found" in str(error):
+            # A failed batch cancels the batches that are still running or waiting, and every
+            # task is awaited before the error is raised
+            async with asyncio.TaskGroup() as task_group:
+                for batch_number, batch in enumerate(batches):
+                    task_group.create_task(upsert_batch(batch_number, batch))
+        except ExceptionGroup as error_group:
+            error = error_group.exceptions[0]
+
+            if is_collection_not_found(error):
+                self._collections.discard(collection_name)
                 raise CollectionNotFoundError(
                     message=f"Collection {collection_name} not found!"
                 ) from error
-            else:
-                raise error
-        except Exception as error:
+
             logger.error("Error uploading data points to Qdrant: %s", str(error))
             raise error
-        finally:
-            await client.close()
 
     async def create_vector_index(self, index_name: str, index_property_name: str):
         await self.create_collection(f"{index_name}_{index_property_name}")
@@ -142,9 +297,7 @@ class QDrantAdapter(VectorDBInterface):
 
     async def retrieve(self, collection_name: str, data_point_ids: list[str]):
         client = self.get_qdrant_client()
-        results = await client.retrieve(collection_name, data_point_ids, with_payload=True)
-        await client.close()
-        return results
+        return await client.retrieve(collection_name, data_point_ids, with_payload=True)
 
     async def search(
         self,
@@ -153,9 +306,10 @@ class QDrantAdapter(VectorDBInterface):
         query_vector: Optional[List[float]] = None,
         limit: int = 15,
         with_vector: bool = False,
+        hnsw_ef: Optional[int] = None,
+        rescore: Optional[bool] = None,
+        oversampling: Optional[float] = None,
     ) -> List[ScoredResult]:
-        from qdrant_client.http.exceptions import UnexpectedResponse
-
         if query_text is None and query_vector is None:
             raise InvalidValueError(message="One of query_text or query_vector must be provided!")
 
@@ -165,38 +319,30 @@ class QDrantAdapter(VectorDBInterface):
         if query_vector is None:
             query_vector = (await self.embed_data([query_text]))[0]
 
+        client = self.get_qdrant_client()
+
         try:
-            client = self.get_qdrant_client()
             if limit == 0:
-                collection_size = await client.count(collection_name=collection_name)
+                limit = await self._count_points(collection_name)
+                if limit == 0:
+                    return []
 
-            results = await client.search(
+            response = await client.query_points(
                 collection_name=collection_name,
-                query_vector=models.NamedVector(
-                    name="text",
-                    vector=query_vector
-                    if query_vector is not None
-                    else (await self.embed_data([query_text]))[0],
-                ),
-                limit=limit if limit > 0 else collection_size.count,
+                query=query_vector,
+                using="text",
+                limit=limit,
                 with_vectors=with_vector,
+                search_params=create_search_params(hnsw_ef, rescore, oversampling),
             )
+        except Exception as error:
+            if is_collection_not_found(error):
+                # Deleted since it was cached
+                self._collections.discard(collection_name)
+                return []
+            raise error
 
-            await client.close()
-
-            return [
-                ScoredResult(
-                    id=parse_id(result.id),
-                    payload={
-                        **result.payload,
-                        "id": parse_id(result.id),
-                    },
-                    score=1 - result.score,
-                )
-                for result in results
-            ]
-        finally:
-            await client.close()
+        return [to_scored_result(result) for result in response.points]
 
     async def batch_search(
         self,
@@ -204,40 +350,62 @@ class QDrantAdapter(VectorDBInterface):
         query_texts: List[str],
         limit: int = None,
         with_vectors: bool = False,
-    ):
+        score_threshold: Optional[float] = 0.9,
+    ) -> List[List[ScoredResult]]:
         """
         Perform batch search in a Qdrant collection with dynamic search requests.
 
         Args:
         - collection_name (str): Name of the collection to search in.
         - query_texts (List[str]): List of query texts to search for.
-        - limit (int): List of result limits for search requests.
+        - limit (int, optional): Maximum number of results per query, 0 or None for all points.
         - with_vectors (bool, optional): Bool indicating whether to return vectors for search requests.
+        - score_threshold (float, optional): Minimum cosine similarity of the results, applied
+          by Qdrant. The scores of the results are distances, so they are at most
+          1 - score_threshold. None returns results of any similarity.
 
         Returns:
-        - results: The search results from Qdrant.
+        - results: A list of search results, ordered by distance, for every query text.
         """
+        if not query_texts:
+            return []
 
         vectors = await self.embed_data(query_texts)
 
-        # Generate dynamic search requests based on the provided embeddings
-        requests = [
-            models.SearchRequest(
-                vector=models.NamedVector(name="text", vector=vector),
-                limit=limit,
-                with_vector=with_vectors,
-            )
-            for vector in vectors
-        ]
-
         client = self.get_qdrant_client()
 
-        # Perform batch search with the dynamically generated requests
-        results = await client.search_batch(collection_name=collection_name, requests=requests)
+        try:
+            # All queries of the batch share a single count of the collection
+            if not limit:
+                limit = await self._count_points(collection_name)
+                if limit == 0:
+                    return [[] for _ in query_texts]
+
+            # Generate dynamic search requests based on the provided embeddings
+            requests = [
+                models.QueryRequest(
+                    query=vector,
+                    using="text",
+                    limit=limit,
+                    score_threshold=score_threshold,
+                    with_vector=with_vectors,
+                    with_payload=True,
+                )
+                for vector in vectors
+            ]
 
-        await client.close()
+            # Perform batch search with the dynamically generated requests
+            responses = await client.query_batch_points(
+                collection_name=collection_name, requests=requests
+            )
+        except Exception as error:
+            if is_collection_not_found(error):
+                self._collections.discard(collection_name)
+            raise error
 
-        return [filter(lambda result: result.score > 0.9, result_group) for result_group in results]
+        return [
+            [to_scored_result(result) for result in response.points] for response in responses
+        ]
 
     async def delete_data_points(self, collection_name: str, data_point_ids: list[str]):
         client = self.get_qdrant_client()
@@ -252,4 +420,4 @@ class QDrantAdapter(VectorDBInterface):
         for collection in response.collections:
             await client.delete_collection(collection.name)
 
-        await client.close()
+        self._collections.clear()